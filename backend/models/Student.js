@@ -3,6 +3,7 @@ const bcrypt = require('bcryptjs');
 
 const weeklyProgressSchema = new mongoose.Schema({
   week: { type: String, required: true }, // "Week 1", "Week 2", etc.
+  weekStart: { type: Date }, // Monday of the week (set by the weekly rollup)
   codechef: { type: Number, default: 0 },
   hackerrank: { type: Number, default: 0 },
   leetcode: { type: Number, default: 0 },
@@ -20,6 +21,11 @@ const platformStatsSchema = new mongoose.Schema({
   lastWeekRating: { type: Number, default: 0 },
   contests: { type: Number, default: 0 },
   contestsAttended: { type: Number, default: 0 },
+  submissionCalendar: [{
+    date: String,
+    count: Number
+  }],
+  submissionCalendarDigest: { type: String }, // hash of submissionCalendar (see scraper/delta.py)
   lastUpdated: { type: Date, default: Date.now }
 });
 
@@ -53,6 +59,10 @@ const codolioStatsSchema = new mongoose.Schema({
     icon: String,
     earnedAt: String
   }],
+  dailySubmissionsDigest: { type: String }, // hashes of the arrays above (see scraper/delta.py)
+  badgesDigest: { type: String },
+  source: { type: String, default: '' }, // 'codolio' (scraped) or 'derived' (codolio_aggregate)
+  derivedAt: { type: Date }, // last codolio_aggregate run for this student
   lastUpdated: { type: Date, default: Date.now }
 });
 
@@ -4,6 +4,7 @@ const { exec } = require('child_process');
 const path = require('path');
 const auth = require('../middleware/auth');
 const Student = require('../models/Student');
+const { buildUpdate } = require('../services/platformDiff');
 
 // POST /api/scraping/trigger - Trigger Python scraper
 router.post('/trigger', auth, async (req, res) => {
@@ -77,21 +78,23 @@ router.post('/student/:id', auth, async (req, res) => {
     const scraperService = require('../services/scraperService');
     const { results, errors } = await scraperService.scrapeAllPlatforms(student);
 
-    // Update student
-    if (results.leetcode) student.platforms.leetcode = results.leetcode;
-    if (results.codechef) student.platforms.codechef = results.codechef;
-    if (results.codeforces) student.platforms.codeforces = results.codeforces;
-    if (results.github) student.platforms.github = results.github;
-    if (results.codolio) student.platforms.codolio = results.codolio;
+    // Update only the fields that changed (no full-document save)
+    const { update, changedPaths } = buildUpdate(
+      student.toObject().platforms,
+      results,
+      { lastScrapedAt: new Date() }
+    );
 
-    student.lastScrapedAt = new Date();
-    await student.save();
+    const updatedStudent = update
+      ? await Student.findByIdAndUpdate(student._id, update, { new: true })
+      : student;
 
     res.json({
       success: true,
-      data: student,
+      data: updatedStudent,
       scrapingResults: {
         successful: Object.keys(results),
+        changed: changedPaths,
         errors: errors
       }
     });
@@ -0,0 +1,122 @@
+// Compare freshly scraped platform results with the stored student and
+// build a $set of only the dotted paths that changed (same rules as
+// scraper/delta.py, including the digests stored next to large arrays).
+const crypto = require('crypto');
+
+// Written alongside a platform's other changes, never a change on their own
+const TOUCH_FIELDS = ['lastUpdated'];
+
+// Large arrays: stored next to a <field>Digest, which is all that is compared
+const DIGEST_FIELDS = ['submissionCalendar', 'dailySubmissions', 'badges'];
+
+const digestField = (field) => `${field}Digest`;
+
+const isPlainObject = (value) =>
+  value !== null && typeof value === 'object' && !Array.isArray(value) && !(value instanceof Date);
+
+// JSON the way Python's json.dumps(value, sort_keys=True) writes it, so
+// digests match the ones delta.py stores
+const pythonJson = (value) => {
+  if (value === null || value === undefined) return 'null';
+  if (value instanceof Date) return JSON.stringify(value.toISOString());
+  if (Array.isArray(value)) return `[${value.map(pythonJson).join(', ')}]`;
+  if (typeof value === 'object') {
+    const entries = Object.keys(value)
+      .filter((key) => value[key] !== undefined)
+      .sort()
+      .map((key) => `${pythonJson(key)}: ${pythonJson(value[key])}`);
+    return `{${entries.join(', ')}}`;
+  }
+  if (typeof value === 'string') {
+    return JSON.stringify(value).replace(/[\u0080-\uffff]/g, (char) => `\\u${char.charCodeAt(0).toString(16).padStart(4, '0')}`);
+  }
+  return JSON.stringify(value);
+};
+
+// Short stable hash of a JSON-like value (same as delta.digest)
+const digest = (value) =>
+  crypto.createHash('sha1').update(pythonJson(value), 'utf8').digest('hex').slice(0, 16);
+
+// Stored value as plain JSON: no subdocument _ids, Dates as ISO strings
+const plainValue = (value) => {
+  if (value instanceof Date) return value.toISOString();
+  if (Array.isArray(value)) return value.map(plainValue);
+  if (isPlainObject(value)) {
+    if (typeof value.toHexString === 'function') return value.toHexString();
+    return Object.fromEntries(
+      Object.entries(value).filter(([key]) => key !== '_id').map(([key, item]) => [key, plainValue(item)])
+    );
+  }
+  return value;
+};
+
+const sameValue = (stored, fresh) => {
+  if (stored instanceof Date || fresh instanceof Date) {
+    const a = stored ? new Date(stored).getTime() : NaN;
+    const b = fresh ? new Date(fresh).getTime() : NaN;
+    return a === b;
+  }
+  if (Array.isArray(stored) || Array.isArray(fresh) || isPlainObject(stored) || isPlainObject(fresh)) {
+    return JSON.stringify(plainValue(stored)) === JSON.stringify(plainValue(fresh));
+  }
+  return stored === fresh;
+};
+
+const diffPaths = (stored, fresh, prefix, changes) => {
+  const base = isPlainObject(stored) ? stored : {};
+  Object.entries(fresh).forEach(([key, value]) => {
+    const path = `${prefix}.${key}`;
+    if (isPlainObject(value) && Object.keys(value).length > 0) {
+      diffPaths(base[key], value, path, changes);
+    } else if (!(key in base) || !sameValue(base[key], value)) {
+      changes[path] = value;
+    }
+  });
+  return changes;
+};
+
+// $set paths for one platform's fresh result
+const platformDelta = (storedPlatforms, platform, fresh) => {
+  const prefix = `platforms.${platform}`;
+  const stored = (storedPlatforms || {})[platform] || {};
+  const compared = Object.fromEntries(
+    Object.entries(fresh).filter(([key]) => !TOUCH_FIELDS.includes(key) && !DIGEST_FIELDS.includes(key))
+  );
+  const changes = diffPaths(stored, compared, prefix, {});
+
+  DIGEST_FIELDS.forEach((field) => {
+    if (!(field in fresh)) return;
+    const freshDigest = digest(fresh[field]);
+    if (stored[digestField(field)] !== freshDigest) {
+      changes[`${prefix}.${field}`] = fresh[field];
+      changes[`${prefix}.${digestField(field)}`] = freshDigest;
+    }
+  });
+
+  if (Object.keys(changes).length > 0) {
+    TOUCH_FIELDS.forEach((field) => {
+      if (field in fresh) changes[`${prefix}.${field}`] = fresh[field];
+    });
+  }
+  return changes;
+};
+
+// Minimal update for a student's fresh results: { update, changedPaths }.
+// update is null when nothing changed.
+const buildUpdate = (storedPlatforms, results, extraSet = {}) => {
+  const changes = {};
+  Object.entries(results).forEach(([platform, fresh]) => {
+    if (fresh) Object.assign(changes, platformDelta(storedPlatforms, platform, fresh));
+  });
+
+  const changedPaths = Object.keys(changes)
+    .filter((path) => !TOUCH_FIELDS.includes(path.split('.').pop()))
+    .sort();
+
+  if (Object.keys(changes).length === 0) {
+    return { update: null, changedPaths };
+  }
+  return { update: { $set: { ...changes, ...extraSet } }, changedPaths };
+};
+
+module.exports = { buildUpdate, platformDelta, digest };
@@ -0,0 +1,64 @@
+// Unit tests for services/platformDiff (no database needed: run with `npm test`)
+const test = require('node:test');
+const assert = require('node:assert');
+const Student = require('../models/Student');
+const { buildUpdate, digest } = require('../services/platformDiff');
+
+const calendar = [
+  { date: '2026-10-16', count: 2 },
+  { date: '2026-10-17', count: 3 }
+];
+const badges = [
+  { id: 'b1', name: '50 Days Badge', description: '50 Days Badge', icon: '', earnedAt: '2025-01-02' }
+];
+
+// What a scrape returns: plain values, no subdocument _ids
+const freshResults = () => ({
+  leetcode: {
+    username: 'saran', rating: 1650, problemsSolved: 412, submissionCalendar: calendar.map((day) => ({ ...day })),
+    lastUpdated: new Date()
+  },
+  codolio: {
+    username: 'Saran@07', totalActiveDays: 187, totalContests: 23, dailySubmissions: calendar.map((day) => ({ ...day })),
+    badges: badges.map((badge) => ({ ...badge })), lastUpdated: new Date()
+  }
+});
+
+// The same data as stored (with digests) and read back through Mongoose
+const storedPlatforms = () => new Student({
+  platforms: {
+    leetcode: {
+      username: 'saran', rating: 1650, problemsSolved: 412, submissionCalendar: calendar,
+      submissionCalendarDigest: digest(calendar), lastUpdated: new Date('2026-10-01')
+    },
+    codolio: {
+      username: 'Saran@07', totalActiveDays: 187, totalContests: 23, dailySubmissions: calendar,
+      dailySubmissionsDigest: digest(calendar), badges, badgesDigest: digest(badges), lastUpdated: new Date('2026-10-01')
+    }
+  }
+}).toObject().platforms;
+
+test('an unchanged student round-tripped through toObject() needs no update', () => {
+  const stored = storedPlatforms();
+  assert.ok(stored.leetcode.submissionCalendar[0]._id, 'stored subdocuments carry _ids');
+
+  const { update, changedPaths } = buildUpdate(stored, freshResults(), { lastScrapedAt: new Date() });
+  assert.strictEqual(update, null);
+  assert.deepStrictEqual(changedPaths, []);
+});
+
+test('a changed array is written with its digest and lastUpdated', () => {
+  const fresh = freshResults();
+  fresh.codolio.dailySubmissions.push({ date: '2026-10-18', count: 1 });
+
+  const { update, changedPaths } = buildUpdate(storedPlatforms(), fresh);
+  assert.deepStrictEqual(changedPaths, ['platforms.codolio.dailySubmissions', 'platforms.codolio.dailySubmissionsDigest']);
+  assert.strictEqual(update.$set['platforms.codolio.dailySubmissionsDigest'], digest(fresh.codolio.dailySubmissions));
+  assert.ok(update.$set['platforms.codolio.lastUpdated'] instanceof Date);
+  assert.ok(!('platforms.leetcode.lastUpdated' in update.$set));
+});
+
+test('digests match the ones scraper/delta.py stores', () => {
+  // python -c "from delta import digest; print(digest([{'date': '2025-10-17', 'count': 2}]))"
+  assert.strictEqual(digest([{ date: '2025-10-17', count: 2 }]), '1e24ac3cccbbbb3d');
+});
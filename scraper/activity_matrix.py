@@ -0,0 +1,240 @@
+"""
+Activity Matrix - Memory-mapped students x days heatmaps with vectorized stats
+One uint16 matrix file per platform (rows = students, columns = the last
+ACTIVITY_DAYS days, newest last) plus a small JSON index. Streaks, active
+days and 7/30-day totals for the whole cohort are a few NumPy passes, and
+worker processes can attach() the same file read-only without copying it.
+"""
+import json
+import os
+import time
+from datetime import date, datetime, timedelta
+import numpy as np
+
+# Where matrix files live (override with ACTIVITY_MATRIX_DIR)
+ACTIVITY_DIR = os.getenv('ACTIVITY_MATRIX_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'activity'))
+
+# Days kept per matrix, ending today (override with ACTIVITY_DAYS)
+ACTIVITY_DAYS = int(os.getenv('ACTIVITY_DAYS', 730))
+
+# Rows are allocated in chunks so adding students rarely rewrites the file
+ROW_CHUNK = 64
+
+MAX_COUNT = np.iinfo(np.uint16).max
+
+def to_date(value):
+    """Date string (YYYY-MM-DD), date or datetime -> date"""
+    if isinstance(value, datetime):
+        return value.date()
+    return value if isinstance(value, date) else date.fromisoformat(str(value)[:10])
+
+def column_date(today, days, column):
+    """Date of a column in a `days`-wide matrix ending `today`"""
+    return today - timedelta(days=days - 1 - int(column))
+
+def row_names(students):
+    """{row key: name} for students - every matrix is keyed by student _id"""
+    return {str(student['_id']): student['name'] for student in students}
+
+def matrix_paths(platform, directory=ACTIVITY_DIR):
+    """(data file, index file) for a platform"""
+    return os.path.join(directory, f'{platform}.u16'), os.path.join(directory, f'{platform}.json')
+
+class ActivityMatrix:
+    """A platform's students x days uint16 matrix on disk, plus its row index"""
+    
+    def __init__(self, platform, directory=ACTIVITY_DIR, days=ACTIVITY_DAYS, today=None):
+        self.platform = platform
+        self.directory = directory
+        self.data_path, self.index_path = matrix_paths(platform, directory)
+        self.today = today or date.today()
+        os.makedirs(directory, exist_ok=True)
+        
+        index = {}
+        if os.path.exists(self.index_path) and os.path.exists(self.data_path):
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+        
+        self.rows = index.get('rows', {})
+        if index and index.get('days') == days:
+            self.days = days
+            self.matrix = np.memmap(self.data_path, dtype=np.uint16, mode='r+', shape=(index['capacity'], days))
+            self._advance(date.fromisoformat(index['end']))
+        else:
+            # New matrix (or a different window length): start empty
+            self.days = days
+            self.rows = {}
+            self.matrix = self._allocate(ROW_CHUNK)
+    
+    def _allocate(self, capacity, keep=None):
+        """Create the data file with `capacity` rows, copying `keep` rows over"""
+        matrix = np.memmap(self.data_path + '.tmp', dtype=np.uint16, mode='w+', shape=(capacity, self.days))
+        if keep is not None:
+            matrix[:keep.shape[0]] = keep
+        matrix.flush()
+        del matrix
+        os.replace(self.data_path + '.tmp', self.data_path)
+        return np.memmap(self.data_path, dtype=np.uint16, mode='r+', shape=(capacity, self.days))
+    
+    def _advance(self, end):
+        """Shift columns left so the last one is today (days that fell out are dropped)"""
+        shift = (self.today - end).days
+        if shift <= 0:
+            # Saved by a run with a later date: its last column stays the window end
+            self.today = max(end, self.today)
+            return
+        if shift >= self.days:
+            self.matrix[:] = 0
+        else:
+            self.matrix[:, :-shift] = self.matrix[:, shift:]
+            self.matrix[:, -shift:] = 0
+        # The file is shifted in place, so its index must move with it
+        self.save()
+    
+    def column(self, day):
+        """Column of a date (None if outside the window)"""
+        offset = (self.today - day).days
+        return self.days - 1 - offset if 0 <= offset < self.days else None
+    
+    def row_for(self, key):
+        """Row of a student key, allocating (and growing the file) if new"""
+        key = str(key)
+        if key not in self.rows:
+            if len(self.rows) >= self.matrix.shape[0]:
+                keep = np.array(self.matrix)
+                del self.matrix
+                self.matrix = self._allocate(keep.shape[0] + ROW_CHUNK, keep)
+            self.rows[key] = len(self.rows)
+        return self.rows[key]
+    
+    def set_days(self, key, days):
+        """Write a student's [{'date', 'count'}] into their row (replacing it)"""
+        dates, counts = [], []
+        for day in days:
+            column = self.column(to_date(day['date']))
+            if column is not None:
+                dates.append(column)
+                counts.append(day['count'])
+        row = self.row_for(key)
+        self.matrix[row] = 0
+        if dates:
+            self.matrix[row, dates] = np.clip(counts, 0, MAX_COUNT)
+    
+    def keys(self):
+        """Student keys in row order"""
+        return sorted(self.rows, key=self.rows.get)
+    
+    def view(self):
+        """The used rows (a view into the memory map, no copy)"""
+        return self.matrix[:len(self.rows)]
+    
+    def save(self):
+        """Flush the data and write the index (atomically)"""
+        self.matrix.flush()
+        index = {
+            'platform': self.platform,
+            'days': self.days,
+            'end': self.today.isoformat(),
+            'capacity': int(self.matrix.shape[0]),
+            'rows': self.rows
+        }
+        with open(self.index_path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(index, f)
+        os.replace(self.index_path + '.tmp', self.index_path)
+
+def attach(platform, directory=ACTIVITY_DIR):
+    """
+    Read-only (matrix view, keys, end date) for another process - the pages
+    are shared with every other reader instead of copied.
+    """
+    data_path, index_path = matrix_paths(platform, directory)
+    with open(index_path, 'r', encoding='utf-8') as f:
+        index = json.load(f)
+    matrix = np.memmap(data_path, dtype=np.uint16, mode='r', shape=(index['capacity'], index['days']))
+    keys = sorted(index['rows'], key=index['rows'].get)
+    return matrix[:len(keys)], keys, date.fromisoformat(index['end'])
+
+def trailing_run(active):
+    """Length of the run of True at the end of each row"""
+    reversed_rows = active[:, ::-1]
+    return np.where(reversed_rows.all(axis=1), active.shape[1], reversed_rows.argmin(axis=1))
+
+def run_lengths(active):
+    """For each cell, the length of the True run ending there (0 where False)"""
+    totals = np.cumsum(active, axis=1, dtype=np.int32)
+    resets = np.maximum.accumulate(np.where(active, 0, totals), axis=1)
+    return totals - resets
+
+def cohort_stats(matrix):
+    """
+    Per-row arrays for a students x days matrix (last column = today):
+    current/longest streak (+ the column each ends on), active days and 7/30-day totals.
+    An empty today does not break the current streak.
+    """
+    active = np.asarray(matrix) > 0
+    days = active.shape[1]
+    today_active = active[:, -1] if days else np.zeros(active.shape[0], dtype=bool)
+    current = np.where(today_active, trailing_run(active), trailing_run(active[:, :-1]) if days > 1 else 0)
+    runs = run_lengths(active)
+    return {
+        'current_streak': current,
+        'current_streak_end': np.where(today_active, days - 1, days - 2),
+        'longest_streak': runs.max(axis=1) if days else np.zeros(active.shape[0], dtype=np.int32),
+        'longest_streak_end': runs.argmax(axis=1) if days else np.zeros(active.shape[0], dtype=np.int64),
+        'active_days': active.sum(axis=1),
+        'total_7d': np.asarray(matrix[:, -7:], dtype=np.int64).sum(axis=1),
+        'total_30d': np.asarray(matrix[:, -30:], dtype=np.int64).sum(axis=1),
+    }
+
+def stats_by_key(matrix_view, keys, today):
+    """cohort_stats() as {key: dict}, with streak dates like github_calendar.compute_streaks"""
+    stats = cohort_stats(matrix_view)
+    days = matrix_view.shape[1]
+    results = {}
+    for row, key in enumerate(keys):
+        current = int(stats['current_streak'][row])
+        longest = int(stats['longest_streak'][row])
+        current_end = column_date(today, days, stats['current_streak_end'][row])
+        longest_end = column_date(today, days, stats['longest_streak_end'][row])
+        results[key] = {
+            'current_streak': current,
+            'longest_streak': longest,
+            'current_streak_start': (current_end - timedelta(days=current - 1)).isoformat() if current else '',
+            'current_streak_end': current_end.isoformat() if current else '',
+            'longest_streak_start': (longest_end - timedelta(days=longest - 1)).isoformat() if longest else '',
+            'longest_streak_end': longest_end.isoformat() if longest else '',
+            'active_days': int(stats['active_days'][row]),
+            'total_7d': int(stats['total_7d'][row]),
+            'total_30d': int(stats['total_30d'][row]),
+        }
+    return results
+
+def main():
+    """Build the Codolio matrix from stored daily submissions and print cohort stats"""
+    from pymongo import MongoClient
+    from dotenv import load_dotenv
+    from roster import iter_roster
+    
+    load_dotenv()
+    client = MongoClient(os.getenv('MONGO_URI', 'mongodb://localhost:27017/go-tracker'))
+    try:
+        students = client['go-tracker'].students
+        codolio = ActivityMatrix('codolio')
+        roster = list(iter_roster(students, fields=('platforms.codolio.dailySubmissions',), platform_fields=()))
+        names = row_names(roster)
+        for student in roster:
+            submissions = ((student.get('platforms') or {}).get('codolio') or {}).get('dailySubmissions') or []
+            codolio.set_days(student['_id'], submissions)
+        codolio.save()
+        
+        start = time.perf_counter()
+        stats = stats_by_key(codolio.view(), codolio.keys(), codolio.today)
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"📊 Codolio activity for {len(stats)} students in {elapsed:.1f} ms")
+        for key, row in sorted(stats.items(), key=lambda item: item[1]['current_streak'], reverse=True)[:5]:
+            print(f"  🔥 {names[key]}: {row['current_streak']} day streak, {row['total_30d']} submissions in 30 days")
+    finally:
+        client.close()
+
+if __name__ == '__main__':
+    main()
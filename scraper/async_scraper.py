@@ -0,0 +1,475 @@
+"""
+Async Scrape Engine - Fetch all platforms for many students at once
+Each platform has its own HTTP client (HTTP/2 where supported) and
+its own concurrency limit, so a roster run takes about as long as the
+slowest platform instead of the sum of every request.
+"""
+import asyncio
+import os
+import httpx
+from datetime import datetime
+from dotenv import load_dotenv
+from platform_scrapers import (
+    PlatformScraper,
+    LEETCODE_GRAPHQL_URL,
+    LEETCODE_PROFILE_QUERY,
+    GITHUB_GRAPHQL_URL,
+    GITHUB_CONTRIBUTIONS_QUERY
+)
+from http_transport import PLATFORM_TIMEOUTS, RETRY_STATUSES, retry_delay
+from github_batch import batch_size_for_budget, build_batch_query, parse_batch_response, is_batch_rejected
+from codeforces_batch import plan_handle_batches, user_info_url, resolve_batch
+from codeforces_sync import sync_handle_async
+from codolio_api import profile_urls, parse_response
+from platforms import PLATFORMS
+from leetcode_batch import (
+    LEETCODE_BATCH_SIZE,
+    build_batch_query as build_leetcode_query,
+    parse_batch_response as parse_leetcode_response,
+    is_batch_rejected as is_leetcode_batch_rejected,
+    split_batch,
+    shrink_batch_size
+)
+from request_batcher import RequestBatcher
+
+load_dotenv()
+
+# Max requests in flight per platform (override with e.g. LEETCODE_CONCURRENCY=2)
+PLATFORM_CONCURRENCY = {
+    'leetcode': int(os.getenv('LEETCODE_CONCURRENCY', 4)),
+    'codechef': int(os.getenv('CODECHEF_CONCURRENCY', 4)),
+    'codeforces': int(os.getenv('CODEFORCES_CONCURRENCY', 1)),
+    'github': int(os.getenv('GITHUB_CONCURRENCY', 8)),
+    'codolio': int(os.getenv('CODOLIO_CONCURRENCY', 4))
+}
+
+# Platforms whose servers speak HTTP/2
+HTTP2_PLATFORMS = {'leetcode', 'github'}
+
+# Handles per batched Codeforces user.info call (split further by URL length)
+CODEFORCES_BATCH_SIZE = int(os.getenv('CODEFORCES_BATCH_SIZE', 300))
+
+# Max students being scraped at the same time
+MAX_STUDENTS_IN_FLIGHT = int(os.getenv('MAX_STUDENTS_IN_FLIGHT', 50))
+
+class AsyncPlatformScraper(PlatformScraper):
+    """Async version of PlatformScraper - returns the same result dicts"""
+    
+    def __init__(self, delay=3, max_retries=3, concurrency=None, rate_limiter=None, codeforces_sync=None, validator_cache=None, breaker=None):
+        super().__init__(
+            delay=delay, max_retries=max_retries, rate_limiter=rate_limiter,
+            codeforces_sync=codeforces_sync, validator_cache=validator_cache, breaker=breaker
+        )
+        self.concurrency = {**PLATFORM_CONCURRENCY, **(concurrency or {})}
+        self.clients = {}
+        self.semaphores = {}
+        self.leetcode_batcher = None
+        self.github_batcher = None
+        self.codeforces_batcher = None
+    
+    async def __aenter__(self):
+        for platform in PLATFORMS:
+            self.clients[platform] = httpx.AsyncClient(
+                http2=platform in HTTP2_PLATFORMS,
+                headers=self.headers,
+                timeout=httpx.Timeout(PLATFORM_TIMEOUTS[platform][1], connect=PLATFORM_TIMEOUTS[platform][0]),
+                follow_redirects=True
+            )
+            self.semaphores[platform] = asyncio.Semaphore(self.concurrency[platform])
+        self.leetcode_batcher = RequestBatcher(self._fetch_leetcode_batch, LEETCODE_BATCH_SIZE)
+        # Codeforces rate limits per call, so wait a little longer to fill each batch
+        self.codeforces_batcher = RequestBatcher(self._fetch_codeforces_batch, CODEFORCES_BATCH_SIZE, max_wait=0.5)
+        if self.github_token:
+            # Coalesce GitHub lookups into aliased GraphQL batches
+            self.github_batcher = RequestBatcher(self._fetch_github_batch, batch_size_for_budget())
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await asyncio.gather(*(client.aclose() for client in self.clients.values()))
+        self.clients = {}
+        await asyncio.to_thread(self.validator_cache.save)
+    
+    async def _request(self, platform, method, url, **kwargs):
+        """
+        Send one request once the host's token bucket allows it, holding the
+        platform's concurrency slot. Retries like HttpTransport.request(),
+        fails fast (CircuitOpenError) for hosts that are down, and sends
+        cacheable GETs conditionally.
+        """
+        conditional = self.validator_cache.cacheable(method, url)
+        if conditional:
+            kwargs['headers'] = {**self.validator_cache.conditional_headers(url), **(kwargs.get('headers') or {})}
+        
+        for attempt in range(self.max_retries + 1):
+            self.breaker.allow(url)
+            await self.rate_limiter.acquire_async(url)
+            try:
+                async with self.semaphores[platform]:
+                    # The circuit may have opened while this request queued
+                    self.breaker.check(url)
+                    response = await self.clients[platform].request(method, url, **kwargs)
+            except httpx.TransportError as e:
+                self.breaker.record_failure(url)
+                if attempt == self.max_retries:
+                    raise
+                wait = retry_delay(attempt)
+                print(f"    🔁 {method} {url} failed ({type(e).__name__}), retrying in {wait:.1f}s")
+            else:
+                self.breaker.record_status(url, response.status_code)
+                if response.status_code not in RETRY_STATUSES or attempt == self.max_retries:
+                    return self._revalidated(url, response) if conditional else response
+                wait = retry_delay(attempt, response)
+                print(f"    🔁 {method} {url} returned {response.status_code}, retrying in {wait:.1f}s")
+            await asyncio.sleep(wait)
+    
+    def _revalidated(self, url, response):
+        """Turn a 304 into a 200 carrying the cached body (and cache fresh 200s)"""
+        entry = self.validator_cache.revalidate(url, response.status_code, response.headers, response.text)
+        if not entry:
+            return response
+        return httpx.Response(
+            200,
+            content=entry['body'].encode('utf-8'),
+            headers={'Content-Type': entry['contentType'], 'X-Cache': 'revalidated'},
+            request=response.request
+        )
+    
+    async def scrape(self, platform, username):
+        """Scrape one platform for one username"""
+        return await getattr(self, f'scrape_{platform}')(username)
+    
+    async def _fetch_leetcode_batch(self, usernames):
+        """
+        One aliased GraphQL request for many users (split in half if LeetCode
+        rejects it). Like fetch_leetcode_profiles(), oversized responses and
+        rejections make the batcher's later batches smaller.
+        """
+        batcher = self.leetcode_batcher
+        query, variables = build_leetcode_query(usernames)
+        try:
+            response = await self._request(
+                'leetcode', 'POST', LEETCODE_GRAPHQL_URL,
+                json={'query': query, 'variables': variables}
+            )
+            payload = response.json() if response.status_code == 200 else {}
+            rejected = is_leetcode_batch_rejected(response.status_code, payload)
+            batcher.max_batch_size = shrink_batch_size(batcher.max_batch_size, len(response.content))
+        except Exception as e:
+            print(f"    ⚠️ LeetCode batch of {len(usernames)} failed: {e}")
+            rejected = True
+        
+        if rejected:
+            halves = split_batch(usernames)
+            if not halves:
+                return {}
+            batcher.max_batch_size = max(1, min(batcher.max_batch_size, len(halves[0])))
+            first, second = await asyncio.gather(*(self._fetch_leetcode_batch(half) for half in halves))
+            return {**first, **second}
+        
+        print(f"    ✅ LeetCode batch: {len(usernames)} users")
+        return parse_leetcode_response(usernames, payload)
+    
+    async def scrape_leetcode(self, username):
+        """Scrape LeetCode profile using batched GraphQL, falling back to a single query"""
+        try:
+            data = None
+            try:
+                data = await self.leetcode_batcher.get(username)
+            except Exception as batch_error:
+                print(f"    ⚠️ LeetCode batch failed for {username}: {batch_error}")
+            
+            if data is None:
+                response = await self._request(
+                    'leetcode', 'POST', LEETCODE_GRAPHQL_URL,
+                    json={'query': LEETCODE_PROFILE_QUERY, 'variables': {'username': username}}
+                )
+                if response.status_code == 200:
+                    data = response.json().get('data')
+            
+            if data:
+                result = self._build_leetcode_result(username, data)
+                if result:
+                    print(f"    ✅ LeetCode {username}: {result['problemsSolved']} problems, Rating: {result['rating']}")
+                    return result
+            
+            print(f"    ⚠️ LeetCode: No data found for {username}")
+            return self._get_default_leetcode(username)
+        
+        except Exception as e:
+            print(f"    ❌ LeetCode error ({username}): {str(e)}")
+            return self._get_default_leetcode(username)
+    
+    async def scrape_codechef(self, username):
+        """Scrape CodeChef profile using API, falling back to the profile page"""
+        try:
+            try:
+                api_response = await self._request('codechef', 'GET', f"https://codechef-api.vercel.app/{username}")
+                if api_response.status_code == 200:
+                    result = self._build_codechef_api_result(username, api_response.json())
+                    print(f"    ✅ CodeChef {username} (API): {result['problemsSolved']} problems, Rating: {result['rating']}")
+                    return result
+            except Exception as api_error:
+                print(f"    ⚠️ CodeChef API failed for {username}, trying web scraping: {api_error}")
+            
+            response = await self._request('codechef', 'GET', f"https://www.codechef.com/users/{username}")
+            
+            if response.status_code == 200:
+                result = self._parse_codechef_html(username, response.text)
+                print(f"    ✅ CodeChef {username} (Web): {result['problemsSolved']} problems, Rating: {result['rating']}, Contests: {result['contests']}")
+                return result
+            
+            print(f"    ⚠️ CodeChef: No data found for {username}")
+            return self._get_default_codechef(username)
+        
+        except Exception as e:
+            print(f"    ❌ CodeChef error ({username}): {str(e)}")
+            return self._get_default_codechef(username)
+    
+    async def _fetch_codeforces_batch(self, handles):
+        """Batched user.info for many handles; rejected handles map to None"""
+        users = {}
+        queue = plan_handle_batches(handles)
+        
+        while queue:
+            batch = queue.pop(0)
+            try:
+                response = await self._request('codeforces', 'GET', user_info_url(batch))
+                payload = response.json()
+                status_code = response.status_code
+            except Exception as e:
+                print(f"    ⚠️ Codeforces user.info batch of {len(batch)} failed: {e}")
+                payload, status_code = {}, None
+            
+            found, bad, retry = resolve_batch(batch, payload, status_code)
+            users.update(found)
+            queue[:0] = retry
+            for handle in bad:
+                print(f"    ⚠️ Codeforces rejected handle: {handle}")
+                self.invalid_handles['codeforces'].add(handle)
+                users[handle] = None
+        
+        print(f"    ✅ Codeforces user.info batch: {len(handles)} handles")
+        return users
+    
+    async def _fetch_codeforces_user(self, username):
+        """user.info entry for a single handle (None if not found)"""
+        response = await self._request('codeforces', 'GET', user_info_url([username]))
+        if response.status_code == 200:
+            data = response.json()
+            if data.get('status') == 'OK' and data.get('result'):
+                return data['result'][0]
+        return None
+    
+    async def _count_codeforces_solved(self, username):
+        """Solved problem count - incremental when a sync store is configured"""
+        if self.codeforces_sync:
+            async def fetch_json(url):
+                return (await self._request('codeforces', 'GET', url)).json()
+            return await sync_handle_async(username, self.codeforces_sync, fetch_json)
+        
+        response = await self._request('codeforces', 'GET', f"https://codeforces.com/api/user.status?handle={username}&from=1&count=10000")
+        if response.status_code == 200:
+            data = response.json()
+            if data.get('status') == 'OK':
+                return len(self._solved_problem_ids(data.get('result', [])))
+        return 0
+    
+    async def scrape_codeforces(self, username):
+        """Scrape Codeforces using official API"""
+        try:
+            user = None
+            try:
+                user = await self.codeforces_batcher.get(username)
+            except Exception as batch_error:
+                print(f"    ⚠️ Codeforces batch failed for {username}: {batch_error}")
+            
+            if username in self.invalid_handles['codeforces']:
+                print(f"    ⚠️ Codeforces: skipping rejected handle {username}")
+                return self._get_default_codeforces(username)
+            
+            if user is None:
+                user = await self._fetch_codeforces_user(username)
+            
+            if user:
+                # Contest history and submissions are independent - fetch both at once
+                contest_response, problems_solved = await asyncio.gather(
+                    self._request('codeforces', 'GET', f"https://codeforces.com/api/user.rating?handle={username}"),
+                    self._count_codeforces_solved(username),
+                    return_exceptions=True
+                )
+                
+                contests = 0
+                if isinstance(contest_response, Exception):
+                    print(f"    ⚠️ Contest count error ({username}): {contest_response}")
+                elif contest_response.status_code == 200:
+                    contest_data = contest_response.json()
+                    if contest_data.get('status') == 'OK':
+                        contests = len(contest_data.get('result', []))
+                
+                if isinstance(problems_solved, Exception):
+                    print(f"    ⚠️ Submission count error ({username}): {problems_solved}")
+                    problems_solved = 0
+                
+                result = self._build_codeforces_result(username, user, contests, problems_solved)
+                print(f"    ✅ Codeforces {username}: {problems_solved} problems, Rating: {result['rating']}, Contests: {contests}")
+                return result
+            
+            print(f"    ⚠️ Codeforces: No data found for {username}")
+            return self._get_default_codeforces(username)
+        
+        except Exception as e:
+            print(f"    ❌ Codeforces error ({username}): {str(e)}")
+            return self._get_default_codeforces(username)
+    
+    async def _fetch_github_batch(self, usernames):
+        """One aliased GraphQL request for many users (split in half if GitHub rejects it)"""
+        query, variables = build_batch_query(usernames)
+        try:
+            response = await self._request(
+                'github', 'POST', GITHUB_GRAPHQL_URL,
+                json={'query': query, 'variables': variables},
+                headers=self.github_headers()
+            )
+            payload = response.json() if response.status_code == 200 else {}
+            rejected = is_batch_rejected(response.status_code, payload)
+        except Exception as e:
+            print(f"    ⚠️ GitHub batch of {len(usernames)} failed: {e}")
+            rejected = True
+        
+        if rejected:
+            if len(usernames) == 1:
+                return {}
+            half = len(usernames) // 2
+            first, second = await asyncio.gather(
+                self._fetch_github_batch(usernames[:half]),
+                self._fetch_github_batch(usernames[half:])
+            )
+            return {**first, **second}
+        
+        users, _ = parse_batch_response(usernames, payload)
+        print(f"    ✅ GitHub batch: {len(usernames)} users")
+        return users
+    
+    async def scrape_github(self, username):
+        """Scrape GitHub profile with contributions"""
+        try:
+            if self.github_batcher:
+                user = await self.github_batcher.get(username)
+                if user:
+                    result = self._build_github_batch_result(username, user)
+                    print(f"    ✅ GitHub {username}: {result['repositories']} repos, {result['contributions']} contributions")
+                    return result
+            
+            headers = self.github_headers()
+            response = await self._request('github', 'GET', f"https://api.github.com/users/{username}", headers=headers)
+            
+            if response.status_code == 200:
+                data = response.json()
+                
+                contributions = 0
+                if self.github_token:
+                    try:
+                        graphql_response = await self._request(
+                            'github', 'POST', GITHUB_GRAPHQL_URL,
+                            json={'query': GITHUB_CONTRIBUTIONS_QUERY, 'variables': {'username': username}},
+                            headers=headers
+                        )
+                        if graphql_response.status_code == 200:
+                            contributions = self._github_graphql_contributions(graphql_response.json())
+                    except Exception as graphql_error:
+                        print(f"    ⚠️ GraphQL error for {username}, trying web scraping: {graphql_error}")
+                
+                if contributions == 0:
+                    try:
+                        profile_response = await self._request('github', 'GET', f"https://github.com/{username}")
+                        if profile_response.status_code == 200:
+                            contributions = self._parse_github_contributions_html(profile_response.text)
+                    except Exception as scrape_error:
+                        print(f"    ⚠️ Web scraping error ({username}): {scrape_error}")
+                
+                result = self._build_github_result(username, data, contributions)
+                print(f"    ✅ GitHub {username}: {result['repositories']} repos, {contributions} contributions")
+                return result
+            
+            print(f"    ⚠️ GitHub: No data found for {username}")
+            return self._get_default_github(username)
+        
+        except Exception as e:
+            print(f"    ❌ GitHub error ({username}): {str(e)}")
+            return self._get_default_github(username)
+    
+    async def scrape_codolio(self, username):
+        """Scrape Codolio profile from its JSON endpoints (the page itself needs Selenium)"""
+        try:
+            for url in profile_urls(username):
+                try:
+                    api_response = await self._request('codolio', 'GET', url, headers={'Accept': 'application/json'})
+                    data = parse_response(username, api_response.status_code, api_response.text)
+                except Exception as api_error:
+                    print(f"    ⚠️ Codolio API error ({username}): {str(api_error)[:50]}")
+                    data = None
+                if data:
+                    print(f"    ✅ Codolio {username}: {data['totalActiveDays']} active days")
+                    return {**self._get_default_codolio(username), **data}
+            
+            response = await self._request('codolio', 'GET', f"https://codolio.com/profile/{username}")
+            
+            if response.status_code == 200:
+                result = self._parse_codolio_html(username, response.text)
+                if result['score'] > 0:
+                    print(f"    ✅ Codolio {username}: Score {result['score']}")
+                    return result
+            
+            return self._get_default_codolio(username)
+        
+        except Exception as e:
+            print(f"    ❌ Codolio error ({username}): {str(e)}")
+            return self._get_default_codolio(username)
+
+async def scrape_student_async(student, scraper, platforms=None):
+    """Scrape a single student's platforms (all with a username by default) concurrently"""
+    usernames = student.get('platformUsernames', {})
+    platforms = [p for p in (platforms or PLATFORMS) if usernames.get(p)]
+    
+    results = await asyncio.gather(*(scraper.scrape(p, usernames[p]) for p in platforms))
+    
+    updated = False
+    student.setdefault('platforms', {})
+    for platform, data in zip(platforms, results):
+        if data:
+            student['platforms'][platform] = data
+            updated = True
+    
+    if updated:
+        student['lastScrapedAt'] = datetime.now()
+    
+    return student, updated
+
+async def scrape_students(work, scraper, max_in_flight=MAX_STUDENTS_IN_FLIGHT):
+    """
+    Scrape many students concurrently.
+    `work` holds (student, platforms) pairs, e.g. from ScrapeScheduler.plan()
+    (platforms=None scrapes every platform). Yields (student, updated, error)
+    as each student finishes; at most `max_in_flight` students are in
+    progress at any time.
+    """
+    pending = {}
+    
+    async def drain(return_when):
+        done, _ = await asyncio.wait(pending.keys(), return_when=return_when)
+        for task in done:
+            student = pending.pop(task)
+            if task.exception():
+                yield student, False, task.exception()
+            else:
+                yield task.result()[0], task.result()[1], None
+    
+    for student, platforms in work:
+        pending[asyncio.ensure_future(scrape_student_async(student, scraper, platforms))] = student
+        if len(pending) >= max_in_flight:
+            async for item in drain(asyncio.FIRST_COMPLETED):
+                yield item
+    
+    while pending:
+        async for item in drain(asyncio.FIRST_COMPLETED):
+            yield item
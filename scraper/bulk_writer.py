@@ -0,0 +1,117 @@
+"""
+Bulk Writer - Write-behind buffer for MongoDB updates
+Scripts queue UpdateOne operations instead of calling update_one per
+student. A background thread sends them with unordered bulk_write once
+BULK_WRITE_SIZE operations are waiting or the oldest has waited
+BULK_FLUSH_SECONDS, so database round trips stay off the scraping path.
+"""
+import atexit
+import os
+import queue
+import threading
+import time
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+# Operations per bulk_write / max seconds an operation waits in the buffer
+BULK_WRITE_SIZE = int(os.getenv('BULK_WRITE_SIZE', 100))
+BULK_FLUSH_SECONDS = float(os.getenv('BULK_FLUSH_SECONDS', 2))
+
+_CLOSE = object()
+
+class BulkWriter:
+    """Collects UpdateOne operations for one collection and writes them in batches"""
+    
+    def __init__(self, collection, batch_size=BULK_WRITE_SIZE, flush_seconds=BULK_FLUSH_SECONDS, verbose=True):
+        self.collection = collection
+        self.batch_size = max(1, batch_size)
+        self.flush_seconds = flush_seconds
+        self.verbose = verbose
+        self.totals = {'batches': 0, 'operations': 0, 'matched': 0, 'modified': 0, 'upserted': 0, 'errors': 0}
+        self.queue = queue.Queue()
+        self.closed = False
+        self.thread = threading.Thread(target=self._run, name='bulk-writer', daemon=True)
+        self.thread.start()
+        atexit.register(self.close)
+    
+    def update_one(self, filter, update, upsert=False):
+        """Queue an update (same arguments as Collection.update_one)"""
+        self.add(UpdateOne(filter, update, upsert=upsert))
+    
+    def add(self, operation):
+        """Queue any bulk_write operation"""
+        if self.closed:
+            raise RuntimeError("BulkWriter is closed")
+        self.queue.put(operation)
+    
+    def flush(self):
+        """Write everything queued so far and wait for it"""
+        if self.closed:
+            return
+        done = threading.Event()
+        self.queue.put(done)
+        done.wait()
+    
+    def close(self):
+        """Write what is left and stop the writer thread"""
+        if self.closed:
+            return self.totals
+        self.closed = True
+        self.queue.put(_CLOSE)
+        self.thread.join()
+        return self.totals
+    
+    def _run(self):
+        batch = []
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(0, deadline - time.monotonic())
+            try:
+                item = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+            
+            if item is _CLOSE or isinstance(item, threading.Event):
+                self._write(batch)
+                batch, deadline = [], None
+                if item is _CLOSE:
+                    return
+                item.set()
+                continue
+            
+            if item is not None:
+                batch.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_seconds
+            
+            if len(batch) >= self.batch_size or (deadline is not None and time.monotonic() >= deadline):
+                self._write(batch)
+                batch, deadline = [], None
+    
+    def _write(self, batch):
+        """One unordered bulk_write, with a one-line report"""
+        if not batch:
+            return
+        errors = 0
+        try:
+            result = self.collection.bulk_write(batch, ordered=False)
+            details = result.bulk_api_result
+        except BulkWriteError as e:
+            details = e.details
+            errors = len(details.get('writeErrors', []))
+            for error in details.get('writeErrors', [])[:3]:
+                print(f"    ⚠️ Bulk write error (op {error.get('index')}): {error.get('errmsg')}")
+        except Exception as e:
+            print(f"    ❌ Bulk write of {len(batch)} operations failed: {e}")
+            details = {}
+            errors = len(batch)
+        
+        self.totals['batches'] += 1
+        self.totals['operations'] += len(batch)
+        self.totals['matched'] += details.get('nMatched', 0)
+        self.totals['modified'] += details.get('nModified', 0)
+        self.totals['upserted'] += details.get('nUpserted', 0)
+        self.totals['errors'] += errors
+        if self.verbose:
+            print(f"    💾 Bulk write: {len(batch)} ops, {details.get('nMatched', 0)} matched, "
+                  f"{details.get('nModified', 0)} modified, {details.get('nUpserted', 0)} upserted, {errors} errors")
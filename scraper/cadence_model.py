@@ -0,0 +1,116 @@
+"""
+Cadence Model - Learn how often each student's profiles change
+Every scrape is compared with the stored values. A profile that changed
+gets a shorter refresh interval; one that did not gets a longer one,
+between CADENCE_MIN_MINUTES and CADENCE_MAX_MINUTES. The scheduler uses
+these intervals in place of the fixed per-platform TTLs.
+"""
+import os
+from datetime import datetime
+from pymongo import UpdateOne
+
+# Fields whose change counts as activity
+TRACKED_FIELDS = {
+    'leetcode': ['problemsSolved', 'rating', 'contestsAttended'],
+    'codechef': ['problemsSolved', 'rating', 'contests'],
+    'codeforces': ['problemsSolved', 'rating', 'contests'],
+    'github': ['contributions', 'repositories'],
+    'codolio': ['score', 'totalSubmissions', 'totalActiveDays']
+}
+
+MIN_INTERVAL_MINUTES = int(os.getenv('CADENCE_MIN_MINUTES', 60))
+MAX_INTERVAL_MINUTES = int(os.getenv('CADENCE_MAX_MINUTES', 7 * 24 * 60))
+
+# Interval multipliers after a scrape that found a change / no change
+SHRINK_FACTOR = 0.5
+GROW_FACTOR = 1.5
+
+def cadence_key(student, platform):
+    return f"{student['_id']}:{platform}"
+
+def tracked_values(platform, data):
+    """The values of a platform's tracked fields (None if there is no data)"""
+    if not data:
+        return None
+    return [data.get(field, 0) or 0 for field in TRACKED_FIELDS.get(platform, [])]
+
+def failed_scrape(platform, old_data, new_data):
+    """True when a result is missing, or all zeros where there was data before"""
+    old_values = tracked_values(platform, old_data)
+    new_values = tracked_values(platform, new_data)
+    return new_values is None or bool(old_values and any(old_values) and not any(new_values))
+
+def next_interval(interval, changed):
+    """Refresh interval (minutes) after one observation"""
+    interval = interval * (SHRINK_FACTOR if changed else GROW_FACTOR)
+    return min(MAX_INTERVAL_MINUTES, max(MIN_INTERVAL_MINUTES, interval))
+
+class CadenceModel:
+    """Per (student, platform) refresh intervals, stored one document each in MongoDB"""
+    
+    def __init__(self, collection, default_minutes=None):
+        # default_minutes: platform -> interval for pairs seen for the first time
+        self.collection = collection
+        self.default_minutes = default_minutes or {}
+        self.entries = None
+        self.changed_keys = set()
+    
+    def load(self):
+        """Read every stored interval (one query per run)"""
+        if self.entries is None:
+            self.entries = {doc['_id']: doc for doc in self.collection.find({})}
+        return self.entries
+    
+    def interval_for(self, student, platform):
+        """Learned refresh interval in minutes (None if nothing has been learned yet)"""
+        entry = self.load().get(cadence_key(student, platform))
+        return entry['intervalMinutes'] if entry else None
+    
+    def last_checked(self, student, platform):
+        """When a pair was last scraped successfully, changed or not (None if never)"""
+        entry = self.load().get(cadence_key(student, platform))
+        return entry.get('lastCheckedAt') if entry else None
+    
+    def observe(self, student, platform, old_data, new_data):
+        """
+        Update the interval after a scrape.
+        Returns True if the tracked values changed.
+        """
+        if failed_scrape(platform, old_data, new_data):
+            # All zeros where there was data is a failed scrape, not a change
+            return False
+        
+        old_values = tracked_values(platform, old_data)
+        changed = old_values is not None and old_values != tracked_values(platform, new_data)
+        key = cadence_key(student, platform)
+        entries = self.load()
+        entry = entries.get(key) or {
+            '_id': key,
+            'studentId': student['_id'],
+            'platform': platform,
+            'intervalMinutes': self.default_minutes.get(platform, MIN_INTERVAL_MINUTES),
+            'checks': 0,
+            'changes': 0
+        }
+        entry['intervalMinutes'] = next_interval(entry['intervalMinutes'], changed)
+        entry['checks'] += 1
+        entry['lastCheckedAt'] = datetime.now()
+        if changed:
+            entry['changes'] += 1
+            entry['lastChangedAt'] = entry['lastCheckedAt']
+        entries[key] = entry
+        self.changed_keys.add(key)
+        return changed
+    
+    def save(self):
+        """Write every interval updated this run in one bulk request"""
+        if not self.changed_keys:
+            return 0
+        operations = [
+            UpdateOne({'_id': key}, {'$set': self.entries[key]}, upsert=True)
+            for key in self.changed_keys
+        ]
+        self.collection.bulk_write(operations, ordered=False)
+        saved = len(operations)
+        self.changed_keys = set()
+        return saved
@@ -3,13 +3,18 @@ Check scraping status
 """
 from pymongo import MongoClient
 from datetime import datetime, timedelta
+from roster import iter_roster
 
 MONGO_URI = 'mongodb://localhost:27017/go-tracker'
 
 try:
     client = MongoClient(MONGO_URI)
     db = client['go-tracker']
-    students = list(db.students.find({'isActive': True}))
+    students = list(iter_roster(
+        db.students,
+        fields=('lastScrapedAt',),
+        platform_fields=('problemsSolved', 'rating', 'repositories', 'contributions')
+    ))
     
     print(f"\n{'='*60}")
     print("📊 SCRAPING STATUS CHECK")
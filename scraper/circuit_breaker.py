@@ -0,0 +1,118 @@
+"""
+Circuit Breaker - Stop waiting on hosts that keep failing
+After CIRCUIT_FAILURES consecutive failures (connection errors, timeouts,
+5xx) a host's circuit opens: requests to it fail at once with
+CircuitOpenError, so callers go straight to their fallback instead of
+sitting through timeouts. After CIRCUIT_RESET_SECONDS one probe request is
+let through (half-open); success closes the circuit, failure opens it again.
+"""
+import os
+import threading
+import time
+from urllib.parse import urlparse
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Consecutive failures that open a host's circuit (override with CIRCUIT_FAILURES)
+FAILURE_THRESHOLD = int(os.getenv('CIRCUIT_FAILURES', 5))
+
+# Seconds a circuit stays open before a probe (override with CIRCUIT_RESET_SECONDS)
+RESET_SECONDS = float(os.getenv('CIRCUIT_RESET_SECONDS', 60))
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half-open'
+
+class CircuitOpenError(ConnectionError):
+    """Raised instead of sending a request to a host whose circuit is open"""
+
+def host_of(url):
+    return urlparse(url).hostname or url
+
+class CircuitBreaker:
+    """Thread-safe closed / open / half-open state per host"""
+    
+    def __init__(self, threshold=FAILURE_THRESHOLD, reset_seconds=RESET_SECONDS, clock=time.monotonic):
+        self.threshold = max(1, threshold)
+        self.reset_seconds = reset_seconds
+        self.clock = clock
+        self.circuits = {}
+        self.tripped = set()
+        self.rejected = 0
+        self.lock = threading.Lock()
+    
+    def _circuit(self, host):
+        if host not in self.circuits:
+            self.circuits[host] = {'state': CLOSED, 'failures': 0, 'openedAt': 0.0, 'probeAt': None}
+        return self.circuits[host]
+    
+    def state(self, url):
+        """Current state of a URL's host"""
+        with self.lock:
+            return self._circuit(host_of(url))['state']
+    
+    def allow(self, url):
+        """Raise CircuitOpenError unless a request to this URL's host may be sent now"""
+        host = host_of(url)
+        with self.lock:
+            circuit = self._circuit(host)
+            now = self.clock()
+            if circuit['state'] == CLOSED:
+                return
+            if circuit['state'] == OPEN and now - circuit['openedAt'] >= self.reset_seconds:
+                circuit['state'] = HALF_OPEN
+                circuit['probeAt'] = None
+            if circuit['state'] == HALF_OPEN:
+                # One probe at a time (a probe that never reported back expires)
+                if circuit['probeAt'] is None or now - circuit['probeAt'] >= self.reset_seconds:
+                    circuit['probeAt'] = now
+                    return
+            error = self._rejection(host, circuit, now)
+        raise error
+    
+    def check(self, url):
+        """Raise CircuitOpenError if the host's circuit opened (never claims the half-open probe)"""
+        host = host_of(url)
+        with self.lock:
+            circuit = self._circuit(host)
+            if circuit['state'] != OPEN:
+                return
+            error = self._rejection(host, circuit, self.clock())
+        raise error
+    
+    def _rejection(self, host, circuit, now):
+        """Count a rejected request and build its error (lock held)"""
+        self.rejected += 1
+        wait = max(0.0, self.reset_seconds - (now - circuit['openedAt']))
+        return CircuitOpenError(f"circuit open for {host} (next probe in {wait:.0f}s)")
+    
+    def record_success(self, url):
+        """A response arrived - close the circuit"""
+        host = host_of(url)
+        with self.lock:
+            circuit = self._circuit(host)
+            if circuit['state'] != CLOSED:
+                print(f"    🟢 {host} is answering again - circuit closed")
+            circuit.update(state=CLOSED, failures=0, probeAt=None)
+    
+    def record_failure(self, url):
+        """A connection error, timeout or 5xx - open the circuit once there are enough in a row"""
+        host = host_of(url)
+        with self.lock:
+            circuit = self._circuit(host)
+            circuit['failures'] += 1
+            if circuit['state'] == HALF_OPEN or (circuit['state'] == CLOSED and circuit['failures'] >= self.threshold):
+                circuit.update(state=OPEN, openedAt=self.clock(), probeAt=None)
+                self.tripped.add(host)
+                print(f"    🔴 {host} failed {circuit['failures']} times in a row - circuit open for {self.reset_seconds:.0f}s")
+    
+    def record_status(self, url, status_code):
+        """Record a response by its status (5xx counts as a failure)"""
+        if status_code >= 500:
+            self.record_failure(url)
+        else:
+            self.record_success(url)
+
+# Shared by every transport and scraper unless one is passed in
+default_breaker = CircuitBreaker()
@@ -0,0 +1,105 @@
+"""
+Codeforces Batch Fetcher - user.info for the whole roster in one or two calls
+Codeforces accepts a semicolon-separated list of handles, so rating,
+maxRating and rank for every student come back from as few requests as
+the URL length allows. Handles the API rejects are flagged so later
+steps can skip them.
+"""
+import re
+from urllib.parse import quote
+from http_transport import HttpTransport
+
+CODEFORCES_API_URL = "https://codeforces.com/api"
+
+# Stay well under what proxies and Codeforces' nginx accept
+MAX_URL_LENGTH = 4000
+
+# "handles: User with handle foo not found"
+NOT_FOUND_PATTERN = re.compile(r'handles?: User with handle (\S+) not found', re.IGNORECASE)
+
+def user_info_url(handles):
+    """user.info URL for a list of handles"""
+    return f"{CODEFORCES_API_URL}/user.info?handles={';'.join(quote(h, safe='') for h in handles)}"
+
+def plan_handle_batches(handles, max_url_length=MAX_URL_LENGTH):
+    """Split handles into batches whose user.info URL fits `max_url_length`"""
+    batches = []
+    batch = []
+    for handle in handles:
+        if batch and len(user_info_url(batch + [handle])) > max_url_length:
+            batches.append(batch)
+            batch = []
+        batch.append(handle)
+    if batch:
+        batches.append(batch)
+    return batches
+
+def rejected_handle(comment, batch):
+    """Handle named in a FAILED comment, if it is one of ours"""
+    match = NOT_FOUND_PATTERN.search(comment or '')
+    if not match:
+        return None
+    named = match.group(1).lower()
+    for handle in batch:
+        if handle.lower() == named:
+            return handle
+    return None
+
+def resolve_batch(batch, payload, status_code):
+    """
+    Work out what to do with one user.info response.
+    Returns (users, rejected, retry_batches): users maps handle -> user dict,
+    rejected lists handles to skip, retry_batches lists batches to send again.
+    """
+    if status_code is None:
+        # Network failure - leave these handles to the per-user path
+        return {}, [], []
+    
+    if status_code == 200 and payload.get('status') == 'OK':
+        # Results come back in request order
+        return dict(zip(batch, payload.get('result', []))), [], []
+    
+    if payload.get('status') == 'FAILED':
+        bad = rejected_handle(payload.get('comment'), batch)
+        if bad:
+            rest = [h for h in batch if h != bad]
+            return {}, [bad], [rest] if rest else []
+        if len(batch) == 1:
+            return {}, batch, []
+    
+    # Unknown failure - narrow it down by halves
+    if len(batch) > 1:
+        half = len(batch) // 2
+        return {}, [], [batch[:half], batch[half:]]
+    return {}, [], []
+
+def fetch_user_infos(handles, transport=None, max_url_length=MAX_URL_LENGTH):
+    """
+    Fetch user.info for many handles.
+    Returns (users, rejected): users maps handle -> Codeforces user dict,
+    rejected is the set of handles the API does not recognise.
+    """
+    transport = transport or HttpTransport()
+    users = {}
+    rejected = set()
+    queue = plan_handle_batches(list(dict.fromkeys(h for h in handles if h)), max_url_length)
+    
+    while queue:
+        batch = queue.pop(0)
+        try:
+            response = transport.get(user_info_url(batch))
+            payload = response.json()
+            status_code = response.status_code
+        except Exception as e:
+            print(f"    ⚠️ Codeforces user.info batch of {len(batch)} failed: {e}")
+            payload, status_code = {}, None
+        
+        found, bad, retry = resolve_batch(batch, payload, status_code)
+        users.update(found)
+        rejected.update(bad)
+        queue[:0] = retry
+        for handle in bad:
+            print(f"    ⚠️ Codeforces rejected handle: {handle}")
+    
+    print(f"    ✅ Codeforces user.info: {len(users)} users, {len(rejected)} rejected")
+    return users, rejected
@@ -0,0 +1,137 @@
+"""
+Codeforces Submission Sync - Incremental solved-problem counts
+Keeps, per handle, the newest submission id already seen, the set of
+solved problems and submissions per day (for activity heatmaps). Later
+runs page through user.status (newest first) only until they reach a
+known submission, so cost follows new activity rather than lifetime
+history.
+"""
+import asyncio
+from datetime import datetime, timezone
+
+CODEFORCES_STATUS_URL = "https://codeforces.com/api/user.status"
+
+# First sync downloads history in big pages; later syncs usually need one small page
+FULL_SYNC_PAGE_SIZE = 1000
+INCREMENTAL_PAGE_SIZE = 50
+
+def status_url(handle, start, count):
+    """user.status URL for one page (start is 1-based)"""
+    return f"{CODEFORCES_STATUS_URL}?handle={handle}&from={start}&count={count}"
+
+def problem_id(submission):
+    """Problem id used in the solved set (e.g. '1850A')"""
+    problem = submission.get('problem', {})
+    return f"{problem.get('contestId', '')}{problem.get('index', '')}"
+
+def submission_day(submission):
+    """UTC date (YYYY-MM-DD) a submission was made"""
+    return datetime.fromtimestamp(submission.get('creationTimeSeconds', 0), timezone.utc).date().isoformat()
+
+def empty_state():
+    return {'lastSubmissionId': 0, 'solved': [], 'days': {}}
+
+def page_size_for(state):
+    """Page size for the next sync of a handle"""
+    return INCREMENTAL_PAGE_SIZE if state.get('lastSubmissionId') and 'days' in state else FULL_SYNC_PAGE_SIZE
+
+class SubmissionSync:
+    """Merges pages of newest-first submissions into a handle's stored state"""
+    
+    def __init__(self, state):
+        self.last_seen_id = state.get('lastSubmissionId', 0)
+        if 'days' not in state:
+            # Stored before per-day counts were kept: read the whole history once more
+            self.last_seen_id = 0
+        self.solved = set(state.get('solved', []))
+        self.days = dict(state.get('days') or {})
+        self.newest_id = self.last_seen_id
+        # New submissions shift the pages mid-sync, so one can show up twice
+        self.seen_ids = set()
+        self.new_submissions = 0
+        self.done = False
+    
+    def add_page(self, submissions, page_size):
+        """Merge one page; sets `done` once a known submission or the end is reached"""
+        for submission in submissions:
+            if submission['id'] <= self.last_seen_id:
+                self.done = True
+                break
+            if submission['id'] in self.seen_ids:
+                continue
+            self.seen_ids.add(submission['id'])
+            self.new_submissions += 1
+            self.newest_id = max(self.newest_id, submission['id'])
+            day = submission_day(submission)
+            self.days[day] = self.days.get(day, 0) + 1
+            if submission.get('verdict') == 'OK':
+                self.solved.add(problem_id(submission))
+        if len(submissions) < page_size:
+            self.done = True
+    
+    def state(self):
+        """State to store once the sync has finished"""
+        return {
+            'lastSubmissionId': self.newest_id,
+            'solved': sorted(self.solved),
+            'days': self.days,
+            'updatedAt': datetime.now()
+        }
+
+class CodeforcesSyncStore:
+    """Per-handle sync state in a MongoDB collection (one document per handle)"""
+    
+    def __init__(self, collection):
+        self.collection = collection
+    
+    def load(self, handle):
+        doc = self.collection.find_one({'_id': handle.lower()})
+        return doc or empty_state()
+    
+    def save(self, handle, state):
+        self.collection.update_one({'_id': handle.lower()}, {'$set': state}, upsert=True)
+
+def sync_handle(handle, store, fetch_json):
+    """
+    Bring one handle's solved set up to date.
+    `fetch_json(url)` returns the parsed user.status response.
+    Returns the number of solved problems (the stored count if the sync failed).
+    """
+    state = store.load(handle)
+    sync = SubmissionSync(state)
+    page_size = page_size_for(state)
+    start = 1
+    
+    while not sync.done:
+        data = fetch_json(status_url(handle, start, page_size))
+        if not data or data.get('status') != 'OK':
+            # Keep the old state so the missed pages are fetched next time
+            print(f"    ⚠️ Codeforces sync failed for {handle}, using stored count")
+            return len(state.get('solved', []))
+        sync.add_page(data.get('result', []), page_size)
+        start += page_size
+    
+    if sync.new_submissions:
+        store.save(handle, sync.state())
+    print(f"    🔄 Codeforces sync {handle}: {sync.new_submissions} new submissions")
+    return len(sync.solved)
+
+async def sync_handle_async(handle, store, fetch_json):
+    """Async version of sync_handle() - `fetch_json` is a coroutine function"""
+    state = await asyncio.to_thread(store.load, handle)
+    sync = SubmissionSync(state)
+    page_size = page_size_for(state)
+    start = 1
+    
+    while not sync.done:
+        data = await fetch_json(status_url(handle, start, page_size))
+        if not data or data.get('status') != 'OK':
+            print(f"    ⚠️ Codeforces sync failed for {handle}, using stored count")
+            return len(state.get('solved', []))
+        sync.add_page(data.get('result', []), page_size)
+        start += page_size
+    
+    if sync.new_submissions:
+        await asyncio.to_thread(store.save, handle, sync.state())
+    print(f"    🔄 Codeforces sync {handle}: {sync.new_submissions} new submissions")
+    return len(sync.solved)
@@ -0,0 +1,170 @@
+"""
+Codolio Aggregate - Codolio-style totals derived from platforms we already scrape
+Codolio mostly adds up LeetCode, CodeChef, Codeforces and GitHub, so the
+same figures are computed here from stored data: LeetCode's
+submissionCalendar, the Codeforces sync's per-day submission counts and
+GitHub contribution calendars (activity matrix + closed-year cache).
+Students whose Codolio handle is missing or broken get data without a browser.
+"""
+import os
+from datetime import date, datetime
+from pymongo import MongoClient
+from dotenv import load_dotenv
+from github_calendar import compute_streaks, CalendarCache, ensure_calendar_collection
+from activity_matrix import attach, column_date
+from bulk_writer import BulkWriter
+from roster import iter_roster
+from delta import platform_delta, stored_fields
+
+load_dotenv()
+
+MONGO_URI = os.getenv('MONGO_URI', 'mongodb://localhost:27017/go-tracker')
+
+# Also replace data scraped from Codolio itself (set CODOLIO_AGGREGATE_ALL=1)
+AGGREGATE_ALL = os.getenv('CODOLIO_AGGREGATE_ALL', '0') == '1'
+
+# Stored fields added up into Codolio's totals
+CONTEST_FIELDS = {'leetcode': 'contestsAttended', 'codechef': 'contests', 'codeforces': 'contests'}
+
+DERIVED_SOURCE = 'derived'
+
+# platforms.codolio fields the aggregate writes
+DERIVED_FIELDS = ('totalActiveDays', 'totalContests', 'totalSubmissions', 'currentStreak', 'maxStreak', 'dailySubmissions', 'source')
+
+# What the aggregate reads from each student (stored Codolio values to diff against)
+ROSTER_FIELDS = (
+    'platforms.leetcode.contestsAttended', 'platforms.leetcode.submissionCalendar',
+    'platforms.codechef.contests', 'platforms.codeforces.contests',
+    *(f'platforms.codolio.{field}' for field in stored_fields(DERIVED_FIELDS))
+)
+
+def day_key(value):
+    """date or date string -> YYYY-MM-DD"""
+    return value.isoformat() if isinstance(value, date) else str(value)[:10]
+
+def merge_calendars(calendars):
+    """Sum several [{'date', 'count'}] calendars into one, sorted by date (active days only)"""
+    counts = {}
+    for calendar in calendars:
+        for day in calendar or []:
+            key = day_key(day['date'])
+            counts[key] = counts.get(key, 0) + (day.get('count') or 0)
+    return [{'date': key, 'count': counts[key]} for key in sorted(counts) if counts[key] > 0]
+
+def needs_aggregate(student, aggregate_all=AGGREGATE_ALL):
+    """True if a student has no usable Codolio data of their own (or everyone is aggregated)"""
+    if aggregate_all or not (student.get('platformUsernames') or {}).get('codolio'):
+        return True
+    codolio = (student.get('platforms') or {}).get('codolio') or {}
+    if codolio.get('source') == DERIVED_SOURCE:
+        return True
+    return not (codolio.get('totalActiveDays') or codolio.get('totalContests'))
+
+def stored_total(platforms, fields):
+    """Sum of one stored field per platform"""
+    return sum(((platforms.get(platform) or {}).get(field) or 0) for platform, field in fields.items())
+
+def aggregate_student(student, codeforces_days=None, github_days=None):
+    """
+    platforms.codolio values for one student from their other platforms.
+    Submissions are the LeetCode and Codeforces per-day counts; GitHub
+    contributions only count towards active days and streaks.
+    """
+    platforms = student.get('platforms') or {}
+    submissions = merge_calendars([(platforms.get('leetcode') or {}).get('submissionCalendar'), codeforces_days])
+    daily = merge_calendars([submissions, github_days])
+    streaks = compute_streaks(daily)
+    return {
+        'totalActiveDays': sum(1 for day in daily if day['count'] > 0),
+        'totalContests': stored_total(platforms, CONTEST_FIELDS),
+        'totalSubmissions': sum(day['count'] for day in submissions),
+        'currentStreak': streaks['current_streak'],
+        'maxStreak': streaks['longest_streak'],
+        'dailySubmissions': daily,
+        'source': DERIVED_SOURCE
+    }
+
+def codeforces_calendars(collection, handles):
+    """{handle (lowercase): [{'date', 'count'}]} from the Codeforces sync state"""
+    calendars = {}
+    cursor = collection.find({'_id': {'$in': [handle.lower() for handle in handles]}}, {'days': 1})
+    try:
+        for doc in cursor:
+            calendars[doc['_id']] = [{'date': day, 'count': count} for day, count in (doc.get('days') or {}).items()]
+    finally:
+        cursor.close()
+    return calendars
+
+def github_calendars(cache, students):
+    """
+    {student _id (str): [{'date', 'count'}]} - cached closed years (by GitHub
+    username), then the activity matrix's recent days (rows keyed by _id)
+    """
+    usernames = {str(s['_id']): (s.get('platformUsernames') or {}).get('github') for s in students}
+    years = cache.closed_years([username for username in usernames.values() if username])
+    calendars = {}
+    for key, username in usernames.items():
+        if username in years:
+            calendars[key] = {day_key(day['date']): day['count'] for days in years[username].values() for day in days}
+    try:
+        matrix, keys, end = attach('github')
+    except (FileNotFoundError, ValueError):
+        matrix, keys, end = None, [], None
+    for row, key in enumerate(keys):
+        if not usernames.get(key):
+            continue
+        days = calendars.setdefault(key, {})
+        # The matrix is newer than the cache, so it wins where they overlap
+        for column in matrix[row].nonzero()[0]:
+            days[column_date(end, matrix.shape[1], column).isoformat()] = int(matrix[row, column])
+    return {key: [{'date': day, 'count': days[day]} for day in sorted(days)] for key, days in calendars.items()}
+
+def run_aggregate(db, aggregate_all=AGGREGATE_ALL):
+    """
+    Derive platforms.codolio for every student who needs it, writing only
+    the fields that changed. Returns (written, unchanged, skipped).
+    """
+    students = list(iter_roster(db.students, fields=ROSTER_FIELDS, platform_fields=()))
+    targets = [student for student in students if needs_aggregate(student, aggregate_all)]
+    
+    def handles(platform):
+        return [h for h in ((s.get('platformUsernames') or {}).get(platform) for s in targets) if h]
+    
+    codeforces = codeforces_calendars(db.codeforcesSync, handles('codeforces'))
+    github = github_calendars(CalendarCache(ensure_calendar_collection(db)), targets)
+    
+    writer = BulkWriter(db.students)
+    written = 0
+    for student in targets:
+        usernames = student.get('platformUsernames') or {}
+        values = aggregate_student(
+            student,
+            codeforces.get((usernames.get('codeforces') or '').lower()),
+            github.get(str(student['_id']))
+        )
+        update = platform_delta(student.get('platforms'), 'codolio', values)
+        if not update:
+            continue
+        # Not lastUpdated: that is the scheduler's clock for the real Codolio scrape
+        update['platforms.codolio.derivedAt'] = datetime.now()
+        writer.update_one({'_id': student['_id']}, {'$set': update})
+        written += 1
+        print(f"  🧮 {student['name']}: {values['totalActiveDays']} active days, {values['totalSubmissions']} submissions, {values['totalContests']} contests")
+    writer.close()
+    return written, len(targets) - written, len(students) - len(targets)
+
+def main():
+    """Derive Codolio data for students without a working Codolio profile"""
+    print("\n" + "="*60)
+    print("🧮 CODOLIO AGGREGATE (from LeetCode, CodeChef, Codeforces, GitHub)")
+    print("="*60)
+    
+    client = MongoClient(MONGO_URI)
+    try:
+        written, unchanged, skipped = run_aggregate(client['go-tracker'])
+        print(f"\n✅ Derived: {written} | ⏸️  Unchanged: {unchanged} | ⏭️  Kept Codolio's own data: {skipped}")
+    finally:
+        client.close()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,157 @@
+"""
+Codolio API - Profile data from the JSON endpoints the Codolio page itself loads
+One HTTP request per profile instead of a headless browser. The endpoints
+are not a documented API, so their URLs are configurable and each field is
+read from one exact path in the profile payload (see FIELD_PATHS and the
+recorded payload in fixtures/). A missing total means the schema changed,
+so the whole profile comes back as None and callers fall back to Selenium.
+"""
+import json
+import os
+from datetime import datetime, timezone
+from urllib.parse import quote
+from dotenv import load_dotenv
+from github_calendar import compute_streaks
+
+load_dotenv()
+
+# Profile endpoints tried in order, {username} is filled in (override with CODOLIO_API_URLS, comma-separated; empty disables)
+CODOLIO_API_URLS = [
+    url.strip()
+    for url in os.getenv('CODOLIO_API_URLS', 'https://api.codolio.com/profile?userKey={username}').split(',')
+    if url.strip()
+]
+
+# Result field: its path in the profile payload (per-platform stats nested
+# under data.platformProfiles reuse some of these names and must not be read)
+FIELD_PATHS = {
+    'totalActiveDays': 'data.overallStats.totalActiveDays',
+    'totalContests': 'data.overallStats.totalContests',
+    'totalSubmissions': 'data.overallStats.totalQuestions',
+    'badges': 'data.badges',
+    'dailySubmissions': 'data.submissionCalendar',
+}
+
+# Without these the payload is not a profile we understand
+REQUIRED_FIELDS = ('totalActiveDays', 'totalContests', 'totalSubmissions')
+
+def value_at(payload, path):
+    """Value at a dotted path (None if any step is missing)"""
+    node = payload
+    for key in path.split('.'):
+        if not isinstance(node, dict):
+            return None
+        node = node.get(key)
+    return node
+
+def to_int(value):
+    """Count from an int, float or numeric string (None if it isn't one)"""
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return None
+
+def to_day(value):
+    """Calendar key (unix seconds/ms or a date string) -> YYYY-MM-DD"""
+    seconds = to_int(value)
+    if seconds is not None:
+        if seconds > 10 ** 11:
+            seconds //= 1000
+        return datetime.fromtimestamp(seconds, timezone.utc).date().isoformat()
+    return str(value)[:10]
+
+def parse_calendar(value):
+    """{day: count} (maybe as a JSON string) or [{'date', 'count'}] -> sorted [{'date', 'count'}]"""
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            return []
+    if isinstance(value, dict):
+        pairs = value.items()
+    elif isinstance(value, list):
+        pairs = [
+            (entry.get('date'), entry.get('count'))
+            for entry in value if isinstance(entry, dict)
+        ]
+    else:
+        return []
+    
+    counts = {}
+    for day, count in pairs:
+        count = to_int(count)
+        if day is None or count is None:
+            continue
+        try:
+            day = to_day(day)
+        except (OverflowError, OSError, ValueError):
+            continue
+        counts[day] = counts.get(day, 0) + count
+    return [{'date': day, 'count': counts[day]} for day in sorted(counts)]
+
+def parse_badges(value):
+    """Badge entries -> the stored badge shape (id, name, description, icon, earnedAt)"""
+    badges = []
+    for entry in value if isinstance(value, list) else []:
+        if not isinstance(entry, dict):
+            continue
+        name = entry.get('name') or entry.get('title') or entry.get('badgeName') or 'Badge'
+        badges.append({
+            'id': str(entry.get('id') or entry.get('_id') or ''),
+            'name': name,
+            'description': entry.get('description') or name,
+            'icon': entry.get('icon') or entry.get('image') or entry.get('imageUrl') or '',
+            'earnedAt': str(entry.get('earnedAt') or entry.get('date') or '')
+        })
+    return badges
+
+def map_profile(username, payload):
+    """Codolio JSON payload -> the scrape_codolio result (None if a required field is missing)"""
+    values = {field: value_at(payload, path) for field, path in FIELD_PATHS.items()}
+    totals = {field: to_int(values[field]) for field in REQUIRED_FIELDS}
+    if any(total is None for total in totals.values()):
+        return None
+    
+    daily = parse_calendar(values['dailySubmissions'])
+    result = {
+        'username': username,
+        'totalActiveDays': totals['totalActiveDays'],
+        'totalContests': totals['totalContests'],
+        'totalSubmissions': totals['totalSubmissions'],
+        'badges': parse_badges(values['badges']),
+        'dailySubmissions': daily,
+        'source': 'codolio',
+        'lastUpdated': datetime.now()
+    }
+    if daily:
+        streaks = compute_streaks(daily)
+        result['currentStreak'] = streaks['current_streak']
+        result['maxStreak'] = streaks['longest_streak']
+    return result
+
+def profile_urls(username, urls=None):
+    """Endpoint URLs to try for a username"""
+    return [url.format(username=quote(username, safe='')) for url in (CODOLIO_API_URLS if urls is None else urls)]
+
+def parse_response(username, status_code, text):
+    """Map one endpoint response (None unless it is a usable 200 JSON profile)"""
+    if status_code != 200:
+        return None
+    try:
+        return map_profile(username, json.loads(text))
+    except ValueError:
+        return None
+
+def fetch_codolio_profile(username, transport, urls=None):
+    """Profile through the JSON endpoints, or None so the caller can use a browser"""
+    if not username:
+        return None
+    for url in profile_urls(username, urls):
+        try:
+            response = transport.get(url, headers={'Accept': 'application/json'})
+            result = parse_response(username, response.status_code, response.text)
+            if result:
+                return result
+        except Exception as e:
+            print(f"    ⚠️ Codolio API error for {username}: {str(e)[:50]}")
+    return None
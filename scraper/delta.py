@@ -0,0 +1,91 @@
+"""
+Delta Writer - Turn fresh scrape results into a minimal $set
+Fresh values are compared with the stored document field by field, and
+only the dotted paths that changed are written (or nothing at all).
+Large arrays are compared through a stored digest, so the roster never
+has to read them back. The changed paths double as a "what changed this
+run" report.
+"""
+import hashlib
+import json
+from datetime import datetime
+
+# Written with a platform's other changes, but never a change on their own
+TOUCH_FIELDS = ('lastUpdated',)
+
+# Large arrays: stored next to a <field>Digest, which is all the delta reads back
+DIGEST_FIELDS = ('submissionCalendar', 'dailySubmissions', 'badges')
+
+def digest_field(field):
+    return f'{field}Digest'
+
+def digest(value):
+    """Short stable hash of a JSON-like value"""
+    return hashlib.sha1(json.dumps(value, sort_keys=True, default=str).encode('utf-8')).hexdigest()[:16]
+
+def stored_fields(fields):
+    """Fields to project for comparing results: digests in place of large arrays"""
+    return [digest_field(field) if field in DIGEST_FIELDS else field for field in fields]
+
+def with_digests(prefix, values):
+    """{dotted path: value} for a $set, plus the digest of every large array"""
+    paths = {}
+    for field, value in values.items():
+        paths[f'{prefix}.{field}'] = value
+        if field in DIGEST_FIELDS:
+            paths[f'{prefix}.{digest_field(field)}'] = digest(value)
+    return paths
+
+def same_value(stored, fresh):
+    """True if a stored value and a fresh one are equal as MongoDB would keep them"""
+    if isinstance(stored, datetime) and isinstance(fresh, datetime):
+        # MongoDB keeps milliseconds
+        return abs((stored - fresh).total_seconds()) < 0.001
+    if isinstance(stored, bool) or isinstance(fresh, bool):
+        return stored is fresh
+    return stored == fresh
+
+def diff_paths(stored, fresh, prefix):
+    """{dotted path: fresh value} for every leaf of `fresh` that differs from `stored`"""
+    stored = stored if isinstance(stored, dict) else {}
+    changes = {}
+    for key, value in fresh.items():
+        path = f'{prefix}.{key}'
+        if isinstance(value, dict) and value:
+            changes.update(diff_paths(stored.get(key), value, path))
+        elif key not in stored or not same_value(stored[key], value):
+            changes[path] = value
+    return changes
+
+def platform_delta(stored_platforms, platform, fresh, touch_fields=TOUCH_FIELDS):
+    """
+    $set paths for one platform's fresh result.
+    Touch fields (lastUpdated) are only written alongside a real change.
+    """
+    stored = (stored_platforms or {}).get(platform)
+    prefix = f'platforms.{platform}'
+    plain = {k: v for k, v in fresh.items() if k not in touch_fields and k not in DIGEST_FIELDS}
+    changes = diff_paths(stored, plain, prefix)
+    for field in DIGEST_FIELDS:
+        if field in fresh and (stored or {}).get(digest_field(field)) != digest(fresh[field]):
+            changes.update(with_digests(prefix, {field: fresh[field]}))
+    if changes:
+        for field in touch_fields:
+            if field in fresh:
+                changes[f'{prefix}.{field}'] = fresh[field]
+    return changes
+
+def build_update(stored_platforms, fresh_platforms, extra_set=None):
+    """
+    Minimal update for a student's fresh platform results.
+    Returns (update, changed paths); update is None when nothing changed.
+    `extra_set` fields are added only if something else changed.
+    """
+    changes = {}
+    for platform, fresh in fresh_platforms.items():
+        if fresh:
+            changes.update(platform_delta(stored_platforms, platform, fresh))
+    changed_paths = sorted(path for path in changes if path.rsplit('.', 1)[-1] not in TOUCH_FIELDS)
+    if not changes:
+        return None, []
+    return {'$set': {**changes, **(extra_set or {})}}, changed_paths
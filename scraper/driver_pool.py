@@ -0,0 +1,120 @@
+"""
+Driver Pool - A fixed set of reusable Selenium browsers for parallel scraping
+Each worker thread borrows a driver, uses it for one page and gives it
+back. Drivers are started lazily, replaced after `pages_per_driver` pages
+(long-lived Chrome keeps growing) or after an error, and quit on close().
+The factory gets a slot number (0..size-1) that stays with the position
+in the pool, so per-browser state such as a disk cache survives recycling.
+"""
+import os
+import queue
+import threading
+from contextlib import contextmanager
+
+# Browsers running at once (override with CODOLIO_WORKERS)
+DEFAULT_WORKERS = int(os.getenv('CODOLIO_WORKERS', min(4, os.cpu_count() or 1)))
+
+# Pages a driver serves before it is replaced (override with CODOLIO_PAGES_PER_DRIVER)
+PAGES_PER_DRIVER = int(os.getenv('CODOLIO_PAGES_PER_DRIVER', 25))
+
+class DriverPool:
+    """Thread-safe pool of up to `size` drivers made by `factory(slot)`"""
+    
+    def __init__(self, factory, size=DEFAULT_WORKERS, pages_per_driver=PAGES_PER_DRIVER):
+        self.factory = factory
+        self.size = max(1, size)
+        self.pages_per_driver = max(1, pages_per_driver)
+        self.idle = queue.Queue()
+        self.lock = threading.Lock()
+        self.started = 0
+        self.recycled = 0
+        self.pages = {}
+        self.slots = {}
+        self.free_slots = list(range(self.size))
+        self.closed = False
+    
+    def _take(self):
+        """An idle driver, a new one if the pool has room, else wait for one"""
+        while True:
+            try:
+                return self.idle.get_nowait()
+            except queue.Empty:
+                pass
+            with self.lock:
+                room = self.started < self.size
+                if room:
+                    self.started += 1
+                    slot = self.free_slots.pop(0)
+            if room:
+                return self._start(slot)
+            try:
+                # A retired driver frees a slot without coming back, so look again
+                return self.idle.get(timeout=1)
+            except queue.Empty:
+                continue
+    
+    def _start(self, slot):
+        """Start a driver in a slot already reserved"""
+        driver = None
+        try:
+            driver = self.factory(slot)
+        finally:
+            if driver is None:
+                self._release(slot)
+        if driver is None:
+            raise RuntimeError("Could not start a browser")
+        self.pages[id(driver)] = 0
+        self.slots[id(driver)] = slot
+        return driver
+    
+    def _release(self, slot):
+        """Give a slot back"""
+        with self.lock:
+            self.started -= 1
+            self.free_slots.append(slot)
+    
+    def _retire(self, driver):
+        """Quit a driver and free its slot"""
+        self.pages.pop(id(driver), None)
+        slot = self.slots.pop(id(driver))
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        # Only now, so the next driver in this slot never shares files with a live one
+        self._release(slot)
+    
+    @contextmanager
+    def driver(self):
+        """Borrow a driver for one page; broken or worn-out drivers are replaced"""
+        if self.closed:
+            raise RuntimeError("DriverPool is closed")
+        driver = self._take()
+        try:
+            yield driver
+        except Exception:
+            self._retire(driver)
+            raise
+        
+        self.pages[id(driver)] = self.pages.get(id(driver), 0) + 1
+        if self.closed or self.pages[id(driver)] >= self.pages_per_driver:
+            self._retire(driver)
+            if not self.closed:
+                self.recycled += 1
+        else:
+            self.idle.put(driver)
+    
+    def close(self):
+        """Quit every idle driver (borrowed ones are quit when returned)"""
+        self.closed = True
+        while True:
+            try:
+                self._retire(self.idle.get_nowait())
+            except queue.Empty:
+                break
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
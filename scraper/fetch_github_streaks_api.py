@@ -1,79 +1,28 @@
 """
-GitHub Streak Fetcher using github-readme-streak-stats API
-Fetches streak data for all 63 students using the public API
+GitHub Streak Fetcher - Exact contribution calendars for all students
+Streaks are computed from GraphQL contribution calendars fetched in
+batches (github_calendar); the streak stats service is only a fallback
 """
-import requests
 import json
-import time
 import os
 from pymongo import MongoClient
 from dotenv import load_dotenv
 from datetime import datetime
+from github_calendar import fetch_streaks, streak_fields, CalendarCache, ensure_calendar_collection, GITHUB_TOKEN
+from bulk_writer import BulkWriter
+from roster import iter_roster, count_roster
+from activity_matrix import ActivityMatrix, stats_by_key, row_names
 
 load_dotenv()
 
 MONGO_URI = os.getenv('MONGO_URI', 'mongodb://localhost:27017/go-tracker')
-GITHUB_TOKEN = os.getenv('GITHUB_TOKEN', '')
-
-# GitHub Streak Stats API endpoint
-STREAK_API_URL = "https://github-readme-streak-stats.herokuapp.com"
-
-def fetch_streak_data(username, token=None):
-    """
-    Fetch streak data from github-readme-streak-stats API
-    Returns JSON with streak information
-    """
-    try:
-        # API endpoint for JSON data
-        url = f"{STREAK_API_URL}/?user={username}&type=json"
-        
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        
-        # Add token if available (for higher rate limits)
-        if token:
-            headers['Authorization'] = f'token {token}'
-        
-        response = requests.get(url, headers=headers, timeout=30)
-        
-        if response.status_code == 200:
-            data = response.json()
-            return data
-        else:
-            print(f"    ⚠️ API returned status {response.status_code}")
-            return None
-            
-    except Exception as e:
-        print(f"    ❌ Error: {e}")
-        return None
-
-def parse_streak_data(data):
-    """Parse the streak data from API response"""
-    if not data:
-        return None
-    
-    try:
-        return {
-            'total_contributions': int(data.get('totalContributions', 0)),
-            'current_streak': int(data.get('currentStreak', {}).get('length', 0)),
-            'longest_streak': int(data.get('longestStreak', {}).get('length', 0)),
-            'current_streak_start': data.get('currentStreak', {}).get('start', ''),
-            'current_streak_end': data.get('currentStreak', {}).get('end', ''),
-            'longest_streak_start': data.get('longestStreak', {}).get('start', ''),
-            'longest_streak_end': data.get('longestStreak', {}).get('end', ''),
-        }
-    except Exception as e:
-        print(f"    ⚠️ Error parsing data: {e}")
-        return None
 
 def fetch_streaks_for_all_students():
     """Fetch GitHub streaks for all 63 students"""
     
     print("\n" + "="*60)
-    print("🔥 GITHUB STREAK FETCHER (Using Streak Stats API)")
+    print("🔥 GITHUB STREAK FETCHER (GraphQL contribution calendars)")
     print("="*60)
-    print(f"📡 API: {STREAK_API_URL}")
     print(f"📡 Connecting to MongoDB: {MONGO_URI}")
     
     try:
@@ -85,84 +34,83 @@ def fetch_streaks_for_all_students():
         print("✅ Connected to MongoDB")
         
         # Get all active students
-        students = list(students_collection.find({'isActive': True}))
-        print(f"📊 Found {len(students)} active students")
+        total_students = count_roster(students_collection)
+        students = list(iter_roster(students_collection))
+        print(f"📊 Found {total_students} active students")
+        
+        # Every calendar up front, many users per request
+        usernames = [s.get('platformUsernames', {}).get('github', '') for s in students]
+        print(f"📅 Fetching contribution calendars for {len([u for u in usernames if u])} GitHub users...")
+        calendar_cache = CalendarCache(ensure_calendar_collection(db))
+        # Matrix rows are keyed by student _id, like every other activity matrix
+        row_keys = {}
+        for student, username in zip(students, usernames):
+            if username:
+                row_keys.setdefault(username, []).append(student['_id'])
+        names = row_names(students)
+        activity = ActivityMatrix('github')
+        streaks = fetch_streaks(usernames, GITHUB_TOKEN, cache=calendar_cache, matrix=activity, row_keys=row_keys)
+        activity.save()
         
         results = []
         updated_count = 0
         failed_count = 0
+        writer = BulkWriter(students_collection)
         
         print(f"\n🔄 Starting streak fetching...")
-        print(f"⏱️  Delay between requests: 2 seconds")
         print(f"{'='*60}\n")
         
         for index, student in enumerate(students, 1):
             github_username = student.get('platformUsernames', {}).get('github', '')
             
             if not github_username:
-                print(f"[{index}/{len(students)}] {student['name']}: ⚠️ No GitHub username")
+                print(f"[{index}/{total_students}] {student['name']}: ⚠️ No GitHub username")
                 continue
             
-            print(f"[{index}/{len(students)}] {student['name']}")
+            print(f"[{index}/{total_students}] {student['name']}")
             print(f"  🔍 GitHub: {github_username}")
             
             try:
-                # Fetch streak data from API
-                data = fetch_streak_data(github_username, GITHUB_TOKEN)
-                
-                if data:
-                    streak_info = parse_streak_data(data)
+                streak_info = streaks.get(github_username)
                     
-                    if streak_info:
-                        result = {
-                            'username': github_username,
-                            'name': student['name'],
-                            'total_contributions': streak_info['total_contributions'],
-                            'current_streak': streak_info['current_streak'],
-                            'longest_streak': streak_info['longest_streak'],
-                            'current_streak_start': streak_info['current_streak_start'],
-                            'current_streak_end': streak_info['current_streak_end'],
-                            'longest_streak_start': streak_info['longest_streak_start'],
-                            'longest_streak_end': streak_info['longest_streak_end'],
-                            'scraped_at': datetime.now()
-                        }
+                if streak_info:
+                    result = {
+                        'username': github_username,
+                        'name': student['name'],
+                        'total_contributions': streak_info['total_contributions'],
+                        'current_streak': streak_info['current_streak'],
+                        'longest_streak': streak_info['longest_streak'],
+                        'current_streak_start': streak_info['current_streak_start'],
+                        'current_streak_end': streak_info['current_streak_end'],
+                        'longest_streak_start': streak_info['longest_streak_start'],
+                        'longest_streak_end': streak_info['longest_streak_end'],
+                        'scraped_at': datetime.now()
+                    }
                         
-                        results.append(result)
+                    results.append(result)
                         
-                        # Update MongoDB
-                        update_data = {
-                            'platforms.github.streak': streak_info['current_streak'],
-                            'platforms.github.longestStreak': streak_info['longest_streak'],
-                            'platforms.github.currentStreakStart': streak_info['current_streak_start'],
-                            'platforms.github.currentStreakEnd': streak_info['current_streak_end'],
-                            'platforms.github.longestStreakStart': streak_info['longest_streak_start'],
-                            'platforms.github.longestStreakEnd': streak_info['longest_streak_end'],
-                            'platforms.github.lastUpdated': datetime.now()
-                        }
+                    # Update MongoDB
+                    update_data = streak_fields(streak_info)
+                    update_data['platforms.github.lastUpdated'] = datetime.now()
                         
-                        students_collection.update_one(
-                            {'_id': student['_id']},
-                            {'$set': update_data}
-                        )
+                    writer.update_one(
+                        {'_id': student['_id']},
+                        {'$set': update_data}
+                    )
                         
-                        updated_count += 1
-                        print(f"    ✅ Current: {streak_info['current_streak']} days ({streak_info['current_streak_start']} to {streak_info['current_streak_end']})")
-                        print(f"    🏆 Longest: {streak_info['longest_streak']} days ({streak_info['longest_streak_start']} to {streak_info['longest_streak_end']})")
-                        print(f"    📊 Total: {streak_info['total_contributions']} contributions")
-                    else:
-                        print(f"    ❌ Could not parse streak data")
-                        failed_count += 1
+                    updated_count += 1
+                    print(f"    ✅ Current: {streak_info['current_streak']} days ({streak_info['current_streak_start']} to {streak_info['current_streak_end']})")
+                    print(f"    🏆 Longest: {streak_info['longest_streak']} days ({streak_info['longest_streak_start']} to {streak_info['longest_streak_end']})")
+                    print(f"    📊 Total: {streak_info['total_contributions']} contributions")
                 else:
-                    print(f"    ❌ No data returned from API")
+                    print(f"    ❌ No contribution calendar for {github_username}")
                     failed_count += 1
-                    
+            
             except Exception as e:
                 print(f"    ❌ Error: {e}")
                 failed_count += 1
-            
-            # Rate limiting - increase delay to avoid overwhelming the API
-            if index < len(students):
-                time.sleep(3)  # 3 seconds between requests
+        
+        writer.close()
         
         # Save results to JSON
         output_file = 'github_streaks_api_results.json'
@@ -173,9 +121,10 @@ def fetch_streaks_for_all_students():
         print(f"\n{'='*60}")
         print("📊 STREAK FETCHING COMPLETE!")
         print(f"{'='*60}")
-        print(f"✅ Successfully updated: {updated_count}/{len(students)}")
-        print(f"❌ Failed: {failed_count}/{len(students)}")
+        print(f"✅ Successfully updated: {updated_count}/{total_students}")
+        print(f"❌ Failed: {failed_count}/{total_students}")
         print(f"💾 Results saved to: {output_file}")
+        print(f"📦 Past-year calendars fetched (then cached): {calendar_cache.fetched}")
         
         # Summary statistics
         if results:
@@ -209,6 +158,14 @@ def fetch_streaks_for_all_students():
             for i, r in enumerate(top_contrib, 1):
                 print(f"  {i}. {r['name']} ({r['username']}): {r['total_contributions']} contributions")
             
+            # Cohort activity from the heatmap matrix (one vectorized pass)
+            activity_stats = stats_by_key(activity.view(), activity.keys(), activity.today)
+            if activity_stats:
+                busiest = sorted(activity_stats.items(), key=lambda item: item[1]['total_30d'], reverse=True)[:5]
+                print(f"\n📆 Most Active (last 30 days):")
+                for i, (key, row) in enumerate(busiest, 1):
+                    print(f"  {i}. {names.get(key, key)}: {row['total_30d']} contributions, {row['active_days']} active days")
+            
             # Students with active streaks
             active_streaks = [r for r in results if r['current_streak'] > 0]
             print(f"\n🎯 Students with Active Streaks: {len(active_streaks)}/{len(results)}")
@@ -220,13 +177,12 @@ def fetch_streaks_for_all_students():
         print(f"\n{'='*60}\n")
         
         client.close()
-        
+    
     except Exception as e:
         print(f"\n❌ Fatal error: {str(e)}")
         import traceback
         traceback.print_exc()
 
 if __name__ == '__main__':
-    print("\n🚀 Using GitHub Readme Streak Stats API")
-    print("📖 Source: https://github.com/DenverCoder1/github-readme-streak-stats")
+    print("\n🚀 Using GitHub GraphQL contribution calendars")
     fetch_streaks_for_all_students()
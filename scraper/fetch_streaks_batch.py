@@ -1,14 +1,14 @@
 """
 Fetch GitHub Streaks in Batches
-Processes 20 users at a time with breaks between batches
+Processes 20 users at a time - one batched GraphQL calendar request per batch
 """
-import requests
 import json
-import time
 import os
 from pymongo import MongoClient
 from dotenv import load_dotenv
 from datetime import datetime
+from github_calendar import fetch_streaks, streak_fields, CalendarCache, ensure_calendar_collection
+from bulk_writer import BulkWriter
 
 load_dotenv()
 
@@ -35,43 +35,7 @@ GITHUB_USERNAMES = [
     "chandran33", "Nishanth355183"
 ]
 
-STREAK_API_URL = "https://github-readme-streak-stats.herokuapp.com"
 BATCH_SIZE = 20
-BREAK_TIME = 10  # seconds between batches
-
-def fetch_streak_data(username, token=None):
-    """Fetch streak data from API"""
-    try:
-        url = f"{STREAK_API_URL}/?user={username}&type=json"
-        headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-        
-        if token:
-            headers['Authorization'] = f'token {token}'
-        
-        response = requests.get(url, headers=headers, timeout=30)
-        
-        if response.status_code == 200:
-            return response.json()
-        else:
-            print(f"    ⚠️ Status {response.status_code}")
-            return None
-    except Exception as e:
-        print(f"    ❌ Error: {str(e)[:50]}")
-        return None
-
-def parse_streak_data(data):
-    """Parse streak data"""
-    if not data:
-        return None
-    
-    try:
-        return {
-            'total_contributions': int(data.get('totalContributions', 0)),
-            'current_streak': int(data.get('currentStreak', {}).get('length', 0)),
-            'longest_streak': int(data.get('longestStreak', {}).get('length', 0)),
-        }
-    except:
-        return None
 
 def fetch_streaks_in_batches():
     """Fetch streaks for all users in batches"""
@@ -81,7 +45,6 @@ def fetch_streaks_in_batches():
     print("="*70)
     print(f"📊 Total users: {len(GITHUB_USERNAMES)}")
     print(f"📦 Batch size: {BATCH_SIZE}")
-    print(f"⏸️  Break time: {BREAK_TIME} seconds")
     print(f"📡 Connecting to MongoDB...")
     
     try:
@@ -91,6 +54,8 @@ def fetch_streaks_in_batches():
         
         print("✅ Connected to MongoDB\n")
         
+        writer = BulkWriter(students_collection)
+        calendar_cache = CalendarCache(ensure_calendar_collection(db))
         results = []
         total_batches = (len(GITHUB_USERNAMES) + BATCH_SIZE - 1) // BATCH_SIZE
         
@@ -104,56 +69,46 @@ def fetch_streaks_in_batches():
             print(f"{'='*70}\n")
             
             batch_results = []
+            streaks = fetch_streaks(batch, GITHUB_TOKEN, cache=calendar_cache)
             
             for idx, username in enumerate(batch, start=start_idx + 1):
                 print(f"[{idx}/{len(GITHUB_USERNAMES)}] {username}")
                 
                 try:
-                    data = fetch_streak_data(username, GITHUB_TOKEN)
-                    
-                    if data:
-                        streak_info = parse_streak_data(data)
+                    streak_info = streaks.get(username)
                         
-                        if streak_info:
-                            result = {
-                                'username': username,
-                                'total_contributions': streak_info['total_contributions'],
-                                'current_streak': streak_info['current_streak'],
-                                'longest_streak': streak_info['longest_streak'],
-                                'scraped_at': datetime.now()
-                            }
+                    if streak_info:
+                        result = {
+                            'username': username,
+                            'total_contributions': streak_info['total_contributions'],
+                            'current_streak': streak_info['current_streak'],
+                            'longest_streak': streak_info['longest_streak'],
+                            'scraped_at': datetime.now()
+                        }
                             
-                            batch_results.append(result)
-                            results.append(result)
+                        batch_results.append(result)
+                        results.append(result)
                             
-                            # Update MongoDB
-                            students_collection.update_one(
-                                {'platformUsernames.github': username},
-                                {'$set': {
-                                    'platforms.github.streak': streak_info['current_streak'],
-                                    'platforms.github.longestStreak': streak_info['longest_streak'],
-                                    'platforms.github.lastUpdated': datetime.now()
-                                }}
-                            )
+                        # Update MongoDB
+                        writer.update_one(
+                            {'platformUsernames.github': username},
+                            {'$set': {
+                                **streak_fields(streak_info),
+                                'platforms.github.lastUpdated': datetime.now()
+                            }}
+                        )
                             
-                            print(f"    ✅ Current: {streak_info['current_streak']} | Longest: {streak_info['longest_streak']} | Total: {streak_info['total_contributions']}")
-                        else:
-                            print(f"    ❌ Could not parse data")
+                        print(f"    ✅ Current: {streak_info['current_streak']} | Longest: {streak_info['longest_streak']} | Total: {streak_info['total_contributions']}")
                     else:
-                        print(f"    ❌ No data")
-                        
+                        print(f"    ❌ No contribution calendar")
+                
                 except Exception as e:
                     print(f"    ❌ Error: {str(e)[:50]}")
-                
-                time.sleep(2)  # Delay between requests
             
             # Batch summary
             print(f"\n📊 Batch {batch_num + 1} Summary: {len(batch_results)}/{len(batch)} successful")
-            
-            # Break between batches (except after last batch)
-            if batch_num < total_batches - 1:
-                print(f"\n⏸️  Taking a {BREAK_TIME} second break before next batch...")
-                time.sleep(BREAK_TIME)
+        
+        writer.close()
         
         # Save results
         output_file = 'github_streaks_batch_results.json'
@@ -200,7 +155,7 @@ def fetch_streaks_in_batches():
         print(f"\n{'='*70}\n")
         
         client.close()
-        
+    
     except Exception as e:
         print(f"\n❌ Fatal error: {str(e)}")
         import traceback
@@ -208,5 +163,5 @@ def fetch_streaks_in_batches():
 
 if __name__ == '__main__':
     print("\n🚀 Starting batch streak fetcher...")
-    print("📖 Using: github-readme-streak-stats API")
+    print("📖 Using: GitHub GraphQL contribution calendars")
     fetch_streaks_in_batches()
@@ -0,0 +1,249 @@
+"""
+GitHub Batch Fetcher - Many users in one aliased GraphQL request
+Fetches public repos, followers, following, total contributions and the
+contribution calendar for N users per request (u0: user(...) u1: ...),
+sized to GitHub's GraphQL point budget. Calendars for specific past
+years are batched the same way, one alias per (user, year).
+"""
+import math
+import os
+import time
+from datetime import datetime, timezone
+from dotenv import load_dotenv
+from http_transport import HttpTransport
+
+load_dotenv()
+
+GITHUB_GRAPHQL_URL = "https://api.github.com/graphql"
+
+GITHUB_USER_FRAGMENT = """
+fragment BatchUserFields on User {
+    login
+    repositories(privacy: PUBLIC, ownerAffiliations: OWNER) {
+        totalCount
+    }
+    followers {
+        totalCount
+    }
+    following {
+        totalCount
+    }
+    contributionsCollection {
+        contributionYears
+        contributionCalendar {
+            totalContributions
+            weeks {
+                contributionDays {
+                    date
+                    contributionCount
+                }
+            }
+        }
+    }
+}
+"""
+
+GITHUB_YEAR_FRAGMENT = """
+fragment YearCalendarFields on ContributionsCollection {
+    contributionCalendar {
+        totalContributions
+        weeks {
+            contributionDays {
+                date
+                contributionCount
+            }
+        }
+    }
+}
+"""
+
+# GitHub charges a query at (connection requests / 100) points, minimum 1.
+# Each user costs the user lookup plus three connections.
+REQUESTS_PER_USER = 4
+
+# A past-year calendar is the user lookup plus its contributions collection
+REQUESTS_PER_YEAR = 2
+
+# Point budget for a single query (override with GITHUB_BATCH_POINTS)
+MAX_POINTS_PER_QUERY = int(os.getenv('GITHUB_BATCH_POINTS', 1))
+
+# Contribution calendars are slow to resolve; keep queries under GitHub's timeout
+MAX_USERS_PER_QUERY = int(os.getenv('GITHUB_BATCH_MAX_USERS', 25))
+
+def batch_size_for_budget(max_points=MAX_POINTS_PER_QUERY, requests_per_item=REQUESTS_PER_USER):
+    """Most users that fit in one query without exceeding `max_points`"""
+    return max(1, min(MAX_USERS_PER_QUERY, (max_points * 100) // requests_per_item))
+
+def estimate_query_points(user_count, requests_per_item=REQUESTS_PER_USER):
+    """Points GitHub will charge for a batch of `user_count` users"""
+    return max(1, math.ceil(user_count * requests_per_item / 100))
+
+def plan_batches(usernames, max_points=MAX_POINTS_PER_QUERY, requests_per_item=REQUESTS_PER_USER):
+    """Split usernames into batches that each fit the point budget"""
+    size = batch_size_for_budget(max_points, requests_per_item)
+    return [usernames[i:i + size] for i in range(0, len(usernames), size)]
+
+def build_batch_query(usernames):
+    """Aliased GraphQL query and variables for a batch of users"""
+    params = ', '.join(f'$u{i}: String!' for i in range(len(usernames)))
+    fields = '\n'.join(f'    u{i}: user(login: $u{i}) {{ ...BatchUserFields }}' for i in range(len(usernames)))
+    query = (
+        f"query({params}) {{\n"
+        f"    rateLimit {{ cost remaining resetAt }}\n"
+        f"{fields}\n"
+        f"}}\n"
+        f"{GITHUB_USER_FRAGMENT}"
+    )
+    variables = {f'u{i}': username for i, username in enumerate(usernames)}
+    return query, variables
+
+def build_year_query(pairs):
+    """Aliased GraphQL query and variables for (username, year) calendars"""
+    params = ', '.join(f'$u{i}: String!, $f{i}: DateTime!, $t{i}: DateTime!' for i in range(len(pairs)))
+    fields = '\n'.join(
+        f'    y{i}: user(login: $u{i}) {{ contributionsCollection(from: $f{i}, to: $t{i}) {{ ...YearCalendarFields }} }}'
+        for i in range(len(pairs))
+    )
+    query = (
+        f"query({params}) {{\n"
+        f"    rateLimit {{ cost remaining resetAt }}\n"
+        f"{fields}\n"
+        f"}}\n"
+        f"{GITHUB_YEAR_FRAGMENT}"
+    )
+    variables = {}
+    for i, (username, year) in enumerate(pairs):
+        variables[f'u{i}'] = username
+        variables[f'f{i}'] = f'{year}-01-01T00:00:00Z'
+        variables[f't{i}'] = f'{year}-12-31T23:59:59Z'
+    return query, variables
+
+def calendar_days(calendar):
+    """[{'date', 'count'}] from a contributionCalendar node"""
+    return [
+        {'date': day['date'], 'count': day['contributionCount']}
+        for week in calendar.get('weeks', [])
+        for day in week.get('contributionDays', [])
+    ]
+
+def normalize_user(user):
+    """Flatten one aliased `user` node"""
+    collection = user['contributionsCollection']
+    calendar = collection['contributionCalendar']
+    return {
+        'login': user.get('login', ''),
+        'repositories': user['repositories']['totalCount'],
+        'followers': user['followers']['totalCount'],
+        'following': user['following']['totalCount'],
+        'contributions': calendar['totalContributions'],
+        'calendar': calendar_days(calendar),
+        'years': collection.get('contributionYears') or []
+    }
+
+def parse_batch_response(usernames, payload):
+    """
+    Map a batch response back to usernames.
+    Returns ({username: user dict, or None if the user does not exist}, rateLimit dict)
+    """
+    data = payload.get('data') or {}
+    users = {}
+    for i, username in enumerate(usernames):
+        node = data.get(f'u{i}')
+        users[username] = normalize_user(node) if node else None
+    return users, data.get('rateLimit') or {}
+
+def parse_year_response(pairs, payload):
+    """
+    Map a year-calendar response back to (username, year) pairs.
+    Returns ({(username, year): days, or None if the user does not exist}, rateLimit dict)
+    """
+    data = payload.get('data') or {}
+    calendars = {}
+    for i, pair in enumerate(pairs):
+        node = data.get(f'y{i}')
+        calendars[pair] = calendar_days(node['contributionsCollection']['contributionCalendar']) if node else None
+    return calendars, data.get('rateLimit') or {}
+
+def is_batch_rejected(status_code, payload):
+    """True when GitHub refused the whole query (timeout, too complex, bad gateway)"""
+    if status_code != 200:
+        return True
+    return not payload.get('data') and bool(payload.get('errors'))
+
+def wait_for_rate_limit(rate_limit, next_cost):
+    """Sleep until the point budget resets if the next query would exceed it"""
+    remaining = rate_limit.get('remaining')
+    reset_at = rate_limit.get('resetAt')
+    if remaining is None or remaining >= next_cost or not reset_at:
+        return 0
+    reset = datetime.fromisoformat(reset_at.replace('Z', '+00:00'))
+    wait = max(0, (reset - datetime.now(timezone.utc)).total_seconds())
+    print(f"    ⏳ GitHub GraphQL budget exhausted, waiting {wait:.0f}s for reset")
+    time.sleep(wait)
+    return wait
+
+def run_batched_queries(items, build_query, parse_response, token, transport, max_points, requests_per_item, label):
+    """
+    Send `items` in budget-sized aliased queries and merge the parsed results.
+    Batches GitHub rejects are split in half and retried; items that still fail are left out.
+    """
+    headers = {'Authorization': f'bearer {token}'}
+    results = {}
+    queue = plan_batches(list(dict.fromkeys(items)), max_points, requests_per_item)
+    rate_limit = {}
+    
+    while queue:
+        batch = queue.pop(0)
+        wait_for_rate_limit(rate_limit, estimate_query_points(len(batch), requests_per_item))
+        
+        query, variables = build_query(batch)
+        try:
+            response = transport.post(GITHUB_GRAPHQL_URL, json={'query': query, 'variables': variables}, headers=headers)
+            payload = response.json() if response.status_code == 200 else {}
+            rejected = is_batch_rejected(response.status_code, payload)
+        except Exception as e:
+            print(f"    ⚠️ GitHub batch of {len(batch)} failed: {e}")
+            rejected = True
+        
+        if rejected:
+            if len(batch) > 1:
+                half = len(batch) // 2
+                queue[:0] = [batch[:half], batch[half:]]
+            else:
+                print(f"    ❌ GitHub: could not fetch {batch[0]}")
+            continue
+        
+        parsed, rate_limit = parse_response(batch, payload)
+        results.update(parsed)
+        print(f"    ✅ GitHub batch: {len(batch)} {label} (cost {rate_limit.get('cost', '?')}, remaining {rate_limit.get('remaining', '?')})")
+    
+    return results
+
+def fetch_github_users(usernames, token=None, transport=None, max_points=MAX_POINTS_PER_QUERY):
+    """
+    Fetch profile stats and contribution calendars for many users.
+    Returns {username: user dict or None}. Batches GitHub rejects are split
+    in half and retried; usernames that still fail are left out.
+    """
+    token = token or os.getenv('GITHUB_TOKEN', '')
+    if not token:
+        raise ValueError("GITHUB_TOKEN is required for the GraphQL API")
+    
+    return run_batched_queries(
+        usernames, build_batch_query, parse_batch_response,
+        token, transport or HttpTransport(), max_points, REQUESTS_PER_USER, 'users'
+    )
+
+def fetch_github_years(pairs, token=None, transport=None, max_points=MAX_POINTS_PER_QUERY):
+    """
+    Fetch the calendars of specific years: {(username, year): days or None}.
+    Pairs that still fail after splitting are left out.
+    """
+    token = token or os.getenv('GITHUB_TOKEN', '')
+    if not token:
+        raise ValueError("GITHUB_TOKEN is required for the GraphQL API")
+    
+    return run_batched_queries(
+        pairs, build_year_query, parse_year_response,
+        token, transport or HttpTransport(), max_points, REQUESTS_PER_YEAR, 'year calendars'
+    )
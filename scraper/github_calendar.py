@@ -0,0 +1,260 @@
+"""
+GitHub Calendar - Exact contribution calendars and locally computed streaks
+Daily counts come from GraphQL contributionCalendar, many users per
+request (github_batch), and current/longest streaks are computed here.
+Past years never change, so with a CalendarCache each closed year is
+fetched once and merged with the live last-year calendar: all-time
+streaks cost the same as last-year ones.
+The github-readme-streak-stats service is only used without a token.
+"""
+import os
+from datetime import date, datetime, timedelta
+from dotenv import load_dotenv
+from pymongo import UpdateOne
+from pymongo.errors import CollectionInvalid
+from http_transport import HttpTransport
+from github_batch import fetch_github_users, fetch_github_years
+
+load_dotenv()
+
+GITHUB_TOKEN = os.getenv('GITHUB_TOKEN', '')
+
+# Fallback when there is no token for GraphQL
+STREAK_API_URL = "https://github-readme-streak-stats.herokuapp.com"
+
+# Closed-year calendars, one document per (user, year)
+CALENDAR_COLLECTION = 'githubCalendars'
+
+def parse_day(value):
+    """Calendar date string (YYYY-MM-DD), date or datetime -> date"""
+    if isinstance(value, datetime):
+        return value.date()
+    return value if isinstance(value, date) else date.fromisoformat(str(value)[:10])
+
+def compute_streaks(days, total_contributions=None, today=None):
+    """
+    Current and longest streak from exact daily counts ([{'date', 'count'}]).
+    A day with no contributions yet today does not break the current streak.
+    """
+    today = today or date.today()
+    counts = {}
+    for day in days:
+        counts[parse_day(day['date'])] = day['count']
+    ordered = sorted(d for d in counts if d <= today)
+    
+    # Longest run of consecutive days with contributions
+    longest = (0, None, None)
+    run_start = previous = None
+    for day in ordered:
+        if counts[day] <= 0:
+            run_start = None
+        else:
+            if run_start is None or previous != day - timedelta(days=1):
+                run_start = day
+            length = (day - run_start).days + 1
+            if length > longest[0]:
+                longest = (length, run_start, day)
+        previous = day
+    
+    # Current run, ending today (or yesterday if today is still empty)
+    end = today if counts.get(today, 0) > 0 else today - timedelta(days=1)
+    start = end
+    while counts.get(start, 0) > 0:
+        start -= timedelta(days=1)
+    current = (end - start).days
+    
+    return {
+        'total_contributions': sum(counts.values()) if total_contributions is None else total_contributions,
+        'current_streak': current,
+        'longest_streak': longest[0],
+        'current_streak_start': (start + timedelta(days=1)).isoformat() if current else '',
+        'current_streak_end': end.isoformat() if current else '',
+        'longest_streak_start': longest[1].isoformat() if longest[1] else '',
+        'longest_streak_end': longest[2].isoformat() if longest[2] else '',
+    }
+
+def fetch_streak_service(username, transport, token=None):
+    """Streak JSON from github-readme-streak-stats (fallback only)"""
+    headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
+    if token:
+        headers['Authorization'] = f'token {token}'
+    try:
+        response = transport.get(f"{STREAK_API_URL}/?user={username}&type=json", headers=headers)
+        if response.status_code == 200:
+            return response.json()
+        print(f"    ⚠️ Streak service returned status {response.status_code} for {username}")
+    except Exception as e:
+        print(f"    ❌ Streak service error for {username}: {str(e)[:50]}")
+    return None
+
+def parse_streak_data(data):
+    """Streak service response -> the same dict compute_streaks returns"""
+    if not data:
+        return None
+    try:
+        return {
+            'total_contributions': int(data.get('totalContributions', 0)),
+            'current_streak': int(data.get('currentStreak', {}).get('length', 0)),
+            'longest_streak': int(data.get('longestStreak', {}).get('length', 0)),
+            'current_streak_start': data.get('currentStreak', {}).get('start', ''),
+            'current_streak_end': data.get('currentStreak', {}).get('end', ''),
+            'longest_streak_start': data.get('longestStreak', {}).get('start', ''),
+            'longest_streak_end': data.get('longestStreak', {}).get('end', ''),
+        }
+    except Exception as e:
+        print(f"    ⚠️ Error parsing streak data: {e}")
+        return None
+
+def pack_year(year, days):
+    """Daily counts for one year as a list indexed by day of year (0 = Jan 1)"""
+    first = date(year, 1, 1)
+    counts = [0] * ((date(year + 1, 1, 1) - first).days)
+    for day in days:
+        when = parse_day(day['date'])
+        if when.year == year:
+            counts[(when - first).days] = day['count']
+    return counts
+
+def unpack_year(year, counts):
+    """[{'date', 'count'}] back from pack_year()"""
+    first = date(year, 1, 1)
+    return [{'date': first + timedelta(days=i), 'count': count} for i, count in enumerate(counts)]
+
+def missing_years(users, known):
+    """(username, year) pairs of closed years not in `known` ({username: {year: days}})"""
+    this_year = date.today().year
+    return [
+        (username, year)
+        for username, user in users.items()
+        for year in user.get('years', [])
+        if year < this_year and year not in known.get(username, {})
+    ]
+
+def add_years(known, fetched):
+    """Merge fetched {(username, year): days} into `known`"""
+    for (username, year), days in fetched.items():
+        if days is not None:
+            known.setdefault(username, {})[year] = days
+    return known
+
+def with_history(users, closed):
+    """{username: every day of history} - closed years plus each user's live last-year calendar"""
+    calendars = {}
+    for username, user in users.items():
+        history = [day for year in sorted(closed.get(username, {})) for day in closed[username][year]]
+        # The live calendar goes last, so it wins where it overlaps a closed year
+        calendars[username] = history + user['calendar']
+    return calendars
+
+def ensure_calendar_collection(db, name=CALENDAR_COLLECTION):
+    """The calendar cache collection, created with its login index the first time"""
+    if name not in db.list_collection_names():
+        try:
+            db.create_collection(name)
+        except CollectionInvalid:
+            pass  # Created meanwhile by another run
+        db[name].create_index('login')
+    return db[name]
+
+class CalendarCache:
+    """Closed-year calendars in MongoDB - fetched once, kept for good"""
+    
+    def __init__(self, collection):
+        # Indexed by ensure_calendar_collection(), once
+        self.collection = collection
+        self.fetched = 0
+    
+    def closed_years(self, usernames):
+        """{username: {year: days}} for every cached year of these users"""
+        logins = {username.lower(): username for username in usernames}
+        years = {}
+        cursor = self.collection.find({'login': {'$in': list(logins)}}, {'login': 1, 'year': 1, 'counts': 1})
+        try:
+            for doc in cursor:
+                years.setdefault(logins[doc['login']], {})[doc['year']] = unpack_year(doc['year'], doc['counts'])
+        finally:
+            cursor.close()
+        return years
+    
+    def store(self, calendars):
+        """Save fetched {(username, year): days}; only years that have ended"""
+        this_year = date.today().year
+        operations = [
+            UpdateOne(
+                {'_id': f'{username.lower()}:{year}'},
+                {'$set': {
+                    'login': username.lower(),
+                    'year': year,
+                    'counts': pack_year(year, days),
+                    'total': sum(day['count'] for day in days),
+                    'fetchedAt': datetime.now()
+                }},
+                upsert=True
+            )
+            for (username, year), days in calendars.items()
+            if days is not None and year < this_year
+        ]
+        if operations:
+            self.collection.bulk_write(operations, ordered=False)
+            self.fetched += len(operations)
+    
+    def all_time(self, users, token, transport):
+        """
+        {username: every day of history} - cached closed years plus each
+        user's live last-year calendar. Missing closed years are fetched first.
+        """
+        cached = self.closed_years(list(users))
+        missing = missing_years(users, cached)
+        if missing:
+            print(f"    📅 Fetching {len(missing)} past-year calendars (cached from now on)")
+            fetched = fetch_github_years(missing, token=token, transport=transport)
+            self.store(fetched)
+            add_years(cached, fetched)
+        return with_history(users, cached)
+
+def fetch_streaks(usernames, token=None, transport=None, cache=None, matrix=None, row_keys=None):
+    """
+    Streaks for many users: {username: streak dict, or None if unavailable}.
+    Batched GraphQL calendars with a token, the streak service without one.
+    Streaks and total_contributions cover each user's whole history (past
+    years come from the CalendarCache, or are fetched every time without
+    one), like the streak service's totals did; with an
+    ActivityMatrix, each fetched calendar is also recorded in it, in the rows
+    of `row_keys[username]` (the ids of the students with that username).
+    """
+    token = token if token is not None else GITHUB_TOKEN
+    transport = transport or HttpTransport()
+    usernames = list(dict.fromkeys(u for u in usernames if u))
+    
+    if not token:
+        print("    ⚠️ No GITHUB_TOKEN - using the streak service (one user per request)")
+        return {username: parse_streak_data(fetch_streak_service(username, transport)) for username in usernames}
+    
+    users = fetch_github_users(usernames, token=token, transport=transport)
+    found = {username: user for username, user in users.items() if user}
+    if cache:
+        calendars = cache.all_time(found, token, transport)
+    else:
+        missing = missing_years(found, {})
+        closed = add_years({}, fetch_github_years(missing, token=token, transport=transport)) if missing else {}
+        calendars = with_history(found, closed)
+    if matrix is not None:
+        for username, user in found.items():
+            for key in (row_keys or {}).get(username, ()):
+                matrix.set_days(key, user['calendar'])
+    # The all-time total is summed from the whole history (totalContributions only covers the last year)
+    return {
+        username: compute_streaks(calendars[username]) if username in found else None
+        for username in usernames
+    }
+
+def streak_fields(streaks):
+    """platforms.github.* values to $set for one user's streaks"""
+    return {
+        'platforms.github.streak': streaks['current_streak'],
+        'platforms.github.longestStreak': streaks['longest_streak'],
+        'platforms.github.currentStreakStart': streaks['current_streak_start'],
+        'platforms.github.currentStreakEnd': streaks['current_streak_end'],
+        'platforms.github.longestStreakStart': streaks['longest_streak_start'],
+        'platforms.github.longestStreakEnd': streaks['longest_streak_end'],
+    }
@@ -0,0 +1,137 @@
+"""
+HTML Parser - One small interface over fast HTML parsing backends
+Profile pages are parsed with selectolax (lexbor) when it is installed,
+then lxml, then BeautifulSoup. Callers use CSS selectors and get the
+page text once per document, whichever backend did the parsing.
+Set HTML_PARSER=selectolax|lxml|bs4 to force a backend.
+"""
+import os
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+try:
+    import lxml.html
+    import cssselect  # noqa: F401 - lxml needs it for .cssselect()
+except ImportError:
+    lxml = None
+
+from bs4 import BeautifulSoup
+
+BACKENDS = ('selectolax', 'lxml', 'bs4')
+
+def available_backends():
+    """Backends that can be imported here, fastest first"""
+    available = []
+    if LexborHTMLParser is not None:
+        available.append('selectolax')
+    if lxml is not None:
+        available.append('lxml')
+    available.append('bs4')
+    return available
+
+def choose_backend(name=None):
+    """Backend to use: `name`, then HTML_PARSER, then the fastest available"""
+    name = (name or os.getenv('HTML_PARSER', '')).strip().lower()
+    available = available_backends()
+    if name in available:
+        return name
+    if name and name in BACKENDS:
+        print(f"⚠️ HTML parser '{name}' is not installed, using {available[0]}")
+    return available[0]
+
+# Backend used when parse_html() is not given one
+HTML_PARSER = choose_backend()
+
+class HtmlNode:
+    """An element from any backend"""
+    
+    # Whether select() can return this node itself
+    matches_self = False
+    
+    def __init__(self, backend, node):
+        self.backend = backend
+        self.node = node
+    
+    def text(self, strip=False):
+        """Text of the element and its children (strip=True strips each piece)"""
+        if self.backend == 'selectolax':
+            return self.node.text(deep=True, strip=strip)
+        if self.backend == 'lxml':
+            if strip:
+                return ''.join(piece.strip() for piece in self.node.itertext())
+            return self.node.text_content()
+        return self.node.get_text(strip=strip)
+    
+    def attr(self, name, default=None):
+        """Attribute value, or `default` if missing"""
+        if self.backend == 'selectolax':
+            value = self.node.attributes.get(name, default)
+            return default if value is None else value
+        return self.node.get(name, default)
+    
+    def select(self, css):
+        """All descendants matching a CSS selector"""
+        if self.backend == 'selectolax':
+            found = self.node.css(css)
+        elif self.backend == 'lxml':
+            found = self.node.cssselect(css)
+        else:
+            found = self.node.select(css)
+        if self.backend != 'bs4' and not self.matches_self:
+            # lexbor and cssselect also match the element itself; BeautifulSoup does not
+            found = [node for node in found if not self._same(node)]
+        return [HtmlNode(self.backend, node) for node in found]
+    
+    def _same(self, node):
+        if self.backend == 'selectolax':
+            return node.mem_id == self.node.mem_id
+        return node is self.node
+    
+    def select_one(self, css):
+        """First descendant matching a CSS selector, or None"""
+        found = self.select(css)
+        return found[0] if found else None
+    
+    def ancestor(self, tag):
+        """Nearest enclosing element with the given tag name, or None"""
+        if self.backend == 'bs4':
+            parent = self.node.find_parent(tag)
+            return HtmlNode(self.backend, parent) if parent else None
+        if self.backend == 'lxml':
+            for parent in self.node.iterancestors(tag):
+                return HtmlNode(self.backend, parent)
+            return None
+        parent = self.node.parent
+        while parent is not None:
+            if parent.tag == tag:
+                return HtmlNode(self.backend, parent)
+            parent = parent.parent
+        return None
+
+class HtmlDocument(HtmlNode):
+    """A parsed page; `page_text` is extracted once and reused"""
+    
+    # The root <html> element is part of the page
+    matches_self = True
+    
+    def __init__(self, backend, root):
+        super().__init__(backend, root)
+        self._page_text = None
+    
+    @property
+    def page_text(self):
+        if self._page_text is None:
+            self._page_text = self.text()
+        return self._page_text
+
+def parse_html(html, backend=None):
+    """Parse a page with `backend` (default HTML_PARSER)"""
+    backend = choose_backend(backend) if backend else HTML_PARSER
+    if backend == 'selectolax':
+        return HtmlDocument(backend, LexborHTMLParser(html).root)
+    if backend == 'lxml':
+        return HtmlDocument(backend, lxml.html.document_fromstring(html))
+    return HtmlDocument(backend, BeautifulSoup(html, 'html.parser'))
@@ -0,0 +1,160 @@
+"""
+HTTP Transport - Pooled keep-alive sessions with retry and backoff
+One requests.Session per platform reuses TCP/TLS connections across
+calls. Failed requests (connection errors, timeouts, 429 and 5xx) are
+retried with exponential backoff and jitter, honouring Retry-After.
+A per-host CircuitBreaker stops retrying (and calling) hosts that are down.
+With a ValidatorCache, GETs are sent conditionally and 304s are answered
+from the cached body.
+"""
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+import requests
+from requests.adapters import HTTPAdapter
+from rate_limiter import default_limiter
+from circuit_breaker import default_breaker
+
+# host: platform (each platform gets its own connection pool)
+PLATFORM_HOSTS = {
+    'leetcode.com': 'leetcode',
+    'codechef-api.vercel.app': 'codechef',
+    'www.codechef.com': 'codechef',
+    'codeforces.com': 'codeforces',
+    'api.github.com': 'github',
+    'github.com': 'github',
+    'codolio.com': 'codolio',
+    'api.codolio.com': 'codolio',
+    'github-readme-streak-stats.herokuapp.com': 'streak-stats'
+}
+
+# platform: (connect timeout, read timeout) in seconds
+PLATFORM_TIMEOUTS = {
+    'leetcode': (5, 10),
+    'codechef': (5, 15),
+    'codeforces': (5, 20),
+    'github': (5, 10),
+    'codolio': (5, 10),
+    'streak-stats': (5, 30)
+}
+DEFAULT_TIMEOUT = (5, 15)
+
+# Responses worth retrying
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Never wait longer than this for a single retry, whatever Retry-After says
+MAX_RETRY_WAIT = 60
+
+def platform_for(url):
+    """Platform name for a URL (falls back to the host itself)"""
+    host = urlparse(url).hostname or ''
+    return PLATFORM_HOSTS.get(host, host)
+
+def timeout_for(url):
+    """(connect, read) timeout for a URL's platform"""
+    return PLATFORM_TIMEOUTS.get(platform_for(url), DEFAULT_TIMEOUT)
+
+def backoff_delay(attempt, base=0.5, cap=MAX_RETRY_WAIT):
+    """Exponential backoff with full jitter for retry number `attempt` (0-based)"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+def retry_after_seconds(headers):
+    """Seconds to wait from a Retry-After header (None if absent or invalid)"""
+    value = headers.get('Retry-After')
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            seconds = (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds()
+        except (TypeError, ValueError):
+            return None
+    return min(max(seconds, 0.0), MAX_RETRY_WAIT)
+
+def retry_delay(attempt, response=None):
+    """How long to wait before retrying, preferring the server's Retry-After"""
+    if response is not None:
+        wait = retry_after_seconds(response.headers)
+        if wait is not None:
+            return wait
+    return backoff_delay(attempt)
+
+class HttpTransport:
+    """Keep-alive session pool per platform with retries"""
+    
+    def __init__(self, max_retries=3, rate_limiter=None, pool_size=10, headers=None, cache=None, breaker=None):
+        self.max_retries = max_retries
+        self.rate_limiter = rate_limiter or default_limiter
+        # Fails fast (CircuitOpenError) for hosts that keep failing
+        self.breaker = breaker or default_breaker
+        self.pool_size = pool_size
+        self.headers = headers or {}
+        # Optional ValidatorCache for conditional GETs
+        self.cache = cache
+        self.sessions = {}
+    
+    def session(self, platform):
+        """Keep-alive session for a platform (created on first use)"""
+        if platform not in self.sessions:
+            session = requests.Session()
+            session.headers.update(self.headers)
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            self.sessions[platform] = session
+        return self.sessions[platform]
+    
+    def request(self, method, url, **kwargs):
+        """Send a request, retrying connection errors, timeouts, 429 and 5xx (CircuitOpenError once a host is down)"""
+        session = self.session(platform_for(url))
+        kwargs.setdefault('timeout', timeout_for(url))
+        conditional = self.cache is not None and self.cache.cacheable(method, url)
+        if conditional:
+            kwargs['headers'] = {**self.cache.conditional_headers(url), **(kwargs.get('headers') or {})}
+        
+        for attempt in range(self.max_retries + 1):
+            self.breaker.allow(url)
+            self.rate_limiter.acquire(url)
+            try:
+                response = session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                self.breaker.record_failure(url)
+                if attempt == self.max_retries:
+                    raise
+                wait = retry_delay(attempt)
+                print(f"    🔁 {method} {url} failed ({type(e).__name__}), retrying in {wait:.1f}s")
+            else:
+                self.breaker.record_status(url, response.status_code)
+                if response.status_code not in RETRY_STATUSES or attempt == self.max_retries:
+                    return self._revalidated(url, response) if conditional else response
+                wait = retry_delay(attempt, response)
+                print(f"    🔁 {method} {url} returned {response.status_code}, retrying in {wait:.1f}s")
+            time.sleep(wait)
+    
+    def _revalidated(self, url, response):
+        """Turn a 304 into a 200 carrying the cached body (and cache fresh 200s)"""
+        entry = self.cache.revalidate(url, response.status_code, response.headers, response.text)
+        if entry:
+            response.status_code = 200
+            response._content = entry['body'].encode('utf-8')
+            response.encoding = 'utf-8'
+            response.headers['Content-Type'] = entry['contentType']
+            response.headers['X-Cache'] = 'revalidated'
+        return response
+    
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+    
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+    
+    def close(self):
+        """Close every pooled connection"""
+        for session in self.sessions.values():
+            session.close()
+        self.sessions = {}
+        if self.cache is not None:
+            self.cache.save()
@@ -2,6 +2,7 @@
 from pymongo import MongoClient
 from datetime import datetime
 import re
+from bulk_writer import BulkWriter
 
 # MongoDB connection
 MONGO_URI = 'mongodb://localhost:27017/'
@@ -309,20 +310,16 @@ def import_to_mongodb():
         
         print(f"📊 Parsed {len(students)} students")
         
-        imported = 0
-        updated = 0
-        
+        writer = BulkWriter(students_collection)
         for student in students:
-            result = students_collection.update_one(
+            writer.update_one(
                 {'rollNumber': student['rollNumber']},
                 {'$set': student},
                 upsert=True
             )
-            
-            if result.upserted_id:
-                imported += 1
-            else:
-                updated += 1
+        totals = writer.close()
+        imported = totals['upserted']
+        updated = totals['matched']
         
         print(f"✅ Imported {imported} new students")
         print(f"✅ Updated {updated} existing students")
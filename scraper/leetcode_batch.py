@@ -0,0 +1,123 @@
+"""
+LeetCode Batch Fetcher - Many profiles in one aliased GraphQL request
+Fetches matchedUser and userContestRanking for N usernames per POST
+(u0: matchedUser(...) c0: userContestRanking(...) ...). Batches LeetCode
+rejects are split in half, and the batch size shrinks when responses
+get too large.
+"""
+import os
+from http_transport import HttpTransport
+
+LEETCODE_GRAPHQL_URL = "https://leetcode.com/graphql"
+
+MATCHED_USER_FIELDS = """
+        username
+        profile {
+            ranking
+            reputation
+        }
+        submitStats {
+            acSubmissionNum {
+                difficulty
+                count
+            }
+        }
+        submissionCalendar
+"""
+
+CONTEST_RANKING_FIELDS = """
+        attendedContestsCount
+        rating
+        globalRanking
+        topPercentage
+"""
+
+# Usernames per request (override with LEETCODE_BATCH_SIZE)
+LEETCODE_BATCH_SIZE = int(os.getenv('LEETCODE_BATCH_SIZE', 20))
+
+# Responses bigger than this make later batches smaller
+MAX_RESPONSE_BYTES = 256 * 1024
+
+def build_batch_query(usernames):
+    """Aliased GraphQL query and variables for a batch of usernames"""
+    params = ', '.join(f'$u{i}: String!' for i in range(len(usernames)))
+    fields = []
+    for i in range(len(usernames)):
+        fields.append(f"    u{i}: matchedUser(username: $u{i}) {{{MATCHED_USER_FIELDS}    }}")
+        fields.append(f"    c{i}: userContestRanking(username: $u{i}) {{{CONTEST_RANKING_FIELDS}    }}")
+    query = f"query getUserProfiles({params}) {{\n" + '\n'.join(fields) + "\n}\n"
+    variables = {f'u{i}': username for i, username in enumerate(usernames)}
+    return query, variables
+
+def parse_batch_response(usernames, payload):
+    """
+    Map a batch response back to usernames.
+    Each value has the same shape as a single getUserProfile `data`
+    ({'matchedUser': ..., 'userContestRanking': ...}).
+    """
+    data = payload.get('data') or {}
+    return {
+        username: {
+            'matchedUser': data.get(f'u{i}'),
+            'userContestRanking': data.get(f'c{i}')
+        }
+        for i, username in enumerate(usernames)
+    }
+
+def is_batch_rejected(status_code, payload):
+    """True when LeetCode refused the whole query"""
+    if status_code != 200:
+        return True
+    return not payload.get('data') and bool(payload.get('errors'))
+
+def split_batch(batch):
+    """Two halves of a batch (empty list if it cannot be split)"""
+    if len(batch) < 2:
+        return []
+    half = len(batch) // 2
+    return [batch[:half], batch[half:]]
+
+def shrink_batch_size(batch_size, response_bytes):
+    """Smaller batch size for later requests if this response was too large"""
+    if response_bytes > MAX_RESPONSE_BYTES and batch_size > 1:
+        return batch_size // 2
+    return batch_size
+
+def fetch_leetcode_profiles(usernames, transport=None, batch_size=LEETCODE_BATCH_SIZE, headers=None):
+    """
+    Fetch profile data for many usernames.
+    Returns {username: data} where data has matchedUser (None if the user
+    does not exist) and userContestRanking. Usernames whose batch could
+    not be fetched even on their own are left out.
+    """
+    transport = transport or HttpTransport()
+    pending = list(dict.fromkeys(u for u in usernames if u))
+    queue = []
+    results = {}
+    
+    while pending or queue:
+        batch = queue.pop(0) if queue else [pending.pop(0) for _ in range(min(batch_size, len(pending)))]
+        
+        query, variables = build_batch_query(batch)
+        try:
+            response = transport.post(LEETCODE_GRAPHQL_URL, json={'query': query, 'variables': variables}, headers=headers)
+            payload = response.json() if response.status_code == 200 else {}
+            rejected = is_batch_rejected(response.status_code, payload)
+            batch_size = shrink_batch_size(batch_size, len(response.content))
+        except Exception as e:
+            print(f"    ⚠️ LeetCode batch of {len(batch)} failed: {e}")
+            rejected = True
+        
+        if rejected:
+            halves = split_batch(batch)
+            if halves:
+                batch_size = max(1, min(batch_size, len(halves[0])))
+                queue[:0] = halves
+            else:
+                print(f"    ❌ LeetCode: could not fetch {batch[0]}")
+            continue
+        
+        results.update(parse_batch_response(batch, payload))
+        print(f"    ✅ LeetCode batch: {len(batch)} users")
+    
+    return results
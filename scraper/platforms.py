@@ -0,0 +1,7 @@
+"""
+Platforms - The coding platforms tracked for every student
+Kept free of imports so lightweight readers (roster, scheduler) don't pull
+in the async HTTP engine just for this list.
+"""
+
+PLATFORMS = ['leetcode', 'codechef', 'codeforces', 'github', 'codolio']
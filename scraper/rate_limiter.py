@@ -0,0 +1,102 @@
+"""
+Rate Limiter - One token bucket per host
+Requests to different hosts never wait on each other, and bursts up to
+a host's allowance go through without sleeping.
+
+Override limits with RATE_LIMITS, e.g.
+    RATE_LIMITS="leetcode.com=0.5:3,codeforces.com=0.5:1"
+where each entry is host=requests_per_second:burst.
+"""
+import asyncio
+import os
+import threading
+import time
+from urllib.parse import urlparse
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# host: (requests per second, burst size)
+HOST_LIMITS = {
+    'leetcode.com': (1.0, 5),
+    'codechef-api.vercel.app': (2.0, 5),
+    'www.codechef.com': (0.5, 2),
+    'codeforces.com': (0.5, 1),  # Codeforces allows 1 call per 2 seconds
+    'api.github.com': (5.0, 20),
+    'github.com': (1.0, 5),
+    'codolio.com': (1.0, 5),
+    'api.codolio.com': (2.0, 5),
+    'github-readme-streak-stats.herokuapp.com': (0.5, 5)
+}
+
+def parse_limits(spec):
+    """Parse a RATE_LIMITS string into {host: (rate, burst)}"""
+    limits = {}
+    for entry in (spec or '').split(','):
+        if '=' not in entry:
+            continue
+        host, value = entry.split('=', 1)
+        rate, _, burst = value.partition(':')
+        try:
+            limits[host.strip()] = (float(rate), int(burst or 1))
+        except ValueError:
+            print(f"⚠️ Ignoring bad rate limit entry: {entry}")
+    return limits
+
+class TokenBucket:
+    """Thread-safe token bucket that hands out reservations"""
+    
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def reserve(self):
+        """Take one token and return how long the caller must wait for it"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0.0
+            # Token is borrowed from the future - wait until it has been refilled
+            return -self.tokens / self.rate
+
+class HostRateLimiter:
+    """Keeps a token bucket per host"""
+    
+    def __init__(self, limits=None, default_interval=1.0):
+        self.limits = {**HOST_LIMITS, **parse_limits(os.getenv('RATE_LIMITS')), **(limits or {})}
+        # Hosts without a configured limit get one request per `default_interval`
+        self.default_limit = (1.0 / max(default_interval, 0.001), 1)
+        self.buckets = {}
+        self.lock = threading.Lock()
+    
+    def bucket(self, url_or_host):
+        """Token bucket for a URL's host (created on first use)"""
+        host = urlparse(url_or_host).hostname if '//' in url_or_host else url_or_host
+        with self.lock:
+            if host not in self.buckets:
+                rate, burst = self.limits.get(host, self.default_limit)
+                self.buckets[host] = TokenBucket(rate, burst)
+            return self.buckets[host]
+    
+    def acquire(self, url_or_host):
+        """Block until a request to this host is allowed"""
+        wait = self.bucket(url_or_host).reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+    
+    async def acquire_async(self, url_or_host):
+        """Async version of acquire()"""
+        wait = self.bucket(url_or_host).reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+# Shared limiter so every scraper in a process respects the same budget
+default_limiter = HostRateLimiter()
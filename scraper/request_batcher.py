@@ -0,0 +1,52 @@
+"""
+Request Batcher - Coalesce single-user lookups into batched API calls
+The async engine asks for one user at a time; the batcher collects
+those lookups for a moment and sends them as one request.
+"""
+import asyncio
+
+class RequestBatcher:
+    """Collects keys and resolves them with one `fetch_batch(keys)` call"""
+    
+    def __init__(self, fetch_batch, max_batch_size, max_wait=0.05):
+        # fetch_batch: async function taking a list of keys, returning {key: value}
+        self.fetch_batch = fetch_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.pending = {}
+        self.timer = None
+    
+    async def get(self, key):
+        """Value for one key, fetched together with other pending keys"""
+        if key not in self.pending:
+            self.pending[key] = asyncio.get_running_loop().create_future()
+        future = self.pending[key]
+        
+        if len(self.pending) >= self.max_batch_size:
+            self._flush()
+        elif self.timer is None:
+            self.timer = asyncio.get_running_loop().call_later(self.max_wait, self._flush)
+        
+        return await future
+    
+    def _flush(self):
+        """Send everything collected so far as one batch"""
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        if not self.pending:
+            return
+        batch, self.pending = self.pending, {}
+        asyncio.ensure_future(self._run(batch))
+    
+    async def _run(self, batch):
+        try:
+            results = await self.fetch_batch(list(batch.keys()))
+        except Exception as e:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for key, future in batch.items():
+            if not future.done():
+                future.set_result(results.get(key))
@@ -0,0 +1,48 @@
+"""
+Roster Reader - Stream active students with only the fields a script needs
+Scrapers read `_id`, names and platform usernames plus a few stored
+platform fields, never the full documents (Codolio daily submissions,
+badges, weekly progress...). Results come through a batched cursor, so
+memory stays flat however large the cohort gets.
+"""
+import os
+from platforms import PLATFORMS
+
+# Documents per cursor batch (override with ROSTER_BATCH_SIZE)
+ROSTER_BATCH_SIZE = int(os.getenv('ROSTER_BATCH_SIZE', 200))
+
+ACTIVE_QUERY = {'isActive': True}
+
+# Always read these
+BASE_FIELDS = ('name', 'rollNumber', 'platformUsernames')
+
+# Stored per-platform fields the scheduler needs
+SCHEDULING_FIELDS = ('username', 'lastUpdated')
+
+def roster_projection(fields=(), platform_fields=SCHEDULING_FIELDS, platforms=PLATFORMS):
+    """
+    Projection for BASE_FIELDS, extra top-level `fields` and platforms.<p>.<field>.
+    `platform_fields` is one list for every platform or a {platform: fields} dict.
+    """
+    projection = {field: 1 for field in (*BASE_FIELDS, *fields)}
+    for platform in platforms:
+        fields_for_platform = platform_fields.get(platform, ()) if isinstance(platform_fields, dict) else platform_fields
+        for field in fields_for_platform:
+            projection[f'platforms.{platform}.{field}'] = 1
+    return projection
+
+def count_roster(collection, query=None):
+    """Number of students iter_roster() will yield"""
+    return collection.count_documents(query or ACTIVE_QUERY)
+
+def iter_roster(collection, query=None, fields=(), platform_fields=SCHEDULING_FIELDS, batch_size=ROSTER_BATCH_SIZE):
+    """Active students (or `query` matches), projected and streamed in batches"""
+    cursor = collection.find(
+        query or ACTIVE_QUERY,
+        roster_projection(fields, platform_fields)
+    ).batch_size(batch_size)
+    try:
+        for student in cursor:
+            yield student
+    finally:
+        cursor.close()
@@ -4,9 +4,21 @@ Main scraper script - Fetches real data for all students
 import os
 from pymongo import MongoClient
 from dotenv import load_dotenv
-from platform_scrapers import PlatformScraper
+from async_scraper import AsyncPlatformScraper, scrape_students
+from platforms import PLATFORMS
+from codeforces_sync import CodeforcesSyncStore
+from scrape_scheduler import ScrapeScheduler, PLATFORM_TTLS
+from cadence_model import CadenceModel, failed_scrape
+from snapshot_store import SnapshotStore
+from weekly_rollup import WeeklyRollup, ROLLUP_FIELDS
+from snapshot_retention import SnapshotRetention
+from codolio_aggregate import run_aggregate
+from bulk_writer import BulkWriter
+from roster import iter_roster, count_roster, SCHEDULING_FIELDS
+from delta import build_update, stored_fields
 from datetime import datetime
 import time
+import asyncio
 
 # Load environment variables
 load_dotenv()
@@ -31,25 +43,25 @@ def extract_username_from_url(url, platform):
             else:
                 parts = url.rstrip('/').split('/')
                 return parts[-1] if parts else ''
-                
+        
         elif platform == 'codechef':
             if 'codechef.com/users/' in url:
                 return url.split('/users/')[-1].rstrip('/')
             return ''
-            
+        
         elif platform == 'codeforces':
             if 'codeforces.com/profile/' in url:
                 return url.split('/profile/')[-1].rstrip('/')
             elif ' - Codeforces' in url:
                 return url.split(' - Codeforces')[0].strip()
             return ''
-            
+        
         elif platform == 'github':
             if 'github.com/' in url:
                 username = url.split('github.com/')[-1].rstrip('/')
                 return username.split('/')[0]
             return ''
-            
+        
         elif platform == 'codolio':
             if 'codolio.com/profile/' in url:
                 username = url.split('/profile/')[-1]
@@ -78,7 +90,6 @@ def scrape_student(student, scraper):
         if data:
             student['platforms']['leetcode'] = data
             updated = True
-        scraper.sleep()
     
     # CodeChef
     if student['platformUsernames'].get('codechef'):
@@ -87,7 +98,6 @@ def scrape_student(student, scraper):
         if data:
             student['platforms']['codechef'] = data
             updated = True
-        scraper.sleep()
     
     # Codeforces
     if student['platformUsernames'].get('codeforces'):
@@ -96,7 +106,6 @@ def scrape_student(student, scraper):
         if data:
             student['platforms']['codeforces'] = data
             updated = True
-        scraper.sleep()
     
     # GitHub
     if student['platformUsernames'].get('github'):
@@ -105,7 +114,6 @@ def scrape_student(student, scraper):
         if data:
             student['platforms']['github'] = data
             updated = True
-        scraper.sleep()
     
     # Codolio
     if student['platformUsernames'].get('codolio'):
@@ -114,13 +122,87 @@ def scrape_student(student, scraper):
         if data:
             student['platforms']['codolio'] = data
             updated = True
-        scraper.sleep()
     
     if updated:
         student['lastScrapedAt'] = datetime.now()
     
     return student, updated
 
+async def scrape_roster(plan, writer, scraper, cadence=None, snapshots=None):
+    """Scrape the planned (student, platforms) items concurrently and queue each student's update as it finishes"""
+    total_students = len(plan)
+    updated_count = 0
+    unchanged_count = 0
+    failed_count = 0
+    changed_fields = 0
+    
+    # Values before this run, so the cadence model and the delta can tell what changed
+    planned = {id(student): platforms for student, platforms in plan}
+    previous = {id(student): dict(student.get('platforms') or {}) for student, _ in plan}
+    
+    async with scraper:
+        index = 0
+        async for student, was_updated, error in scrape_students(plan, scraper):
+            index += 1
+            print(f"[{index}/{total_students}] 🎓 {student['name']} ({student['rollNumber']})")
+            
+            if error:
+                print(f"❌ Error processing {student['name']}: {str(error)}")
+                failed_count += 1
+                continue
+            
+            if cadence is not None:
+                for platform in planned[id(student)]:
+                    cadence.observe(student, platform, previous[id(student)].get(platform), student['platforms'].get(platform))
+            
+            if snapshots is not None:
+                # History point for every successful scrape, changed or not
+                for platform in planned[id(student)]:
+                    fresh = student['platforms'].get(platform)
+                    if not failed_scrape(platform, previous[id(student)].get(platform), fresh):
+                        snapshots.append(student['_id'], platform, fresh, student.get('lastScrapedAt'))
+            
+            try:
+                if was_updated:
+                    # Only the fields that changed on the platforms scraped this run
+                    # (last-week stats belong to the weekly rollup)
+                    fresh = {
+                        p: {k: v for k, v in student['platforms'][p].items() if k not in ROLLUP_FIELDS}
+                        for p in planned[id(student)] if student['platforms'].get(p)
+                    }
+                    update, changed_paths = build_update(
+                        previous[id(student)], fresh,
+                        extra_set={'lastScrapedAt': student['lastScrapedAt']}
+                    )
+                    
+                    # Flag handles the platform APIs rejected (keep last 10 errors, like the model does)
+                    handle_errors = scraper.handle_errors(student)
+                    if handle_errors:
+                        update = update or {}
+                        update['$push'] = {'scrapingErrors': {'$each': handle_errors, '$slice': -10}}
+                        print(f"⚠️  Rejected handles: {', '.join(e['error'] for e in handle_errors)}")
+                    
+                    if update:
+                        # Queue the update - the writer saves in batches in the background
+                        writer.update_one({'_id': student['_id']}, update)
+                        updated_count += 1
+                        changed_fields += len(changed_paths)
+                        print(f"✅ Changed: {', '.join(p.replace('platforms.', '') for p in changed_paths) or 'errors only'}")
+                    else:
+                        unchanged_count += 1
+                        print(f"⏸️  No changes - nothing written")
+                else:
+                    print(f"⚠️  No data to update")
+            except Exception as e:
+                print(f"❌ Error saving {student['name']}: {str(e)}")
+                failed_count += 1
+    
+    if cadence is not None:
+        print(f"🧭 Refresh intervals updated: {cadence.save()}")
+    print(f"🔀 Fields changed this run: {changed_fields} ({unchanged_count} students unchanged)")
+    
+    return updated_count, failed_count
+
 def main():
     """Main scraping function"""
     print("\n" + "="*60)
@@ -136,50 +218,51 @@ def main():
         
         print("✅ Connected to MongoDB")
         
-        # Get all active students
-        students = list(students_collection.find({'isActive': True}))
-        print(f"📊 Found {len(students)} active students")
-        
         # Initialize scraper
-        scraper = PlatformScraper(delay=SCRAPING_DELAY)
+        scraper = AsyncPlatformScraper(
+            delay=SCRAPING_DELAY,
+            codeforces_sync=CodeforcesSyncStore(db.codeforcesSync)
+        )
         
-        # Statistics
-        total_students = len(students)
-        updated_count = 0
-        failed_count = 0
+        # Stream active students with the stored values of the fields the scrapers return
+        print(f"📊 Found {count_roster(students_collection)} active students")
+        platform_fields = {p: (*SCHEDULING_FIELDS, *stored_fields(scraper.result_fields(p))) for p in PLATFORMS}
+        students = iter_roster(students_collection, platform_fields=platform_fields)
+        
+        # Only (student, platform) pairs older than their refresh interval are fetched;
+        # intervals are learned per student from how often their numbers change
+        cadence = CadenceModel(db.scrapeCadence, default_minutes=PLATFORM_TTLS)
+        scheduler = ScrapeScheduler(cadence=cadence)
+        plan = scheduler.plan(students)
+        due_count = sum(len(platforms) for _, platforms in plan)
+        print(f"🗓️  Due: {due_count} platform profiles across {len(plan)} students")
+        
+        if not plan:
+            print("✅ All platform data is fresh - nothing to scrape")
+            client.close()
+            return
+        
+        total_students = len(plan)
         
         print(f"\n🔄 Starting scraping process...")
-        print(f"⏱️  Delay between requests: {SCRAPING_DELAY} seconds")
+        print(f"⚡ Concurrency per platform: {scraper.concurrency}")
         print(f"{'='*60}\n")
         
-        # Scrape each student
-        for index, student in enumerate(students, 1):
-            try:
-                print(f"[{index}/{total_students}] Processing...")
-                updated_student, was_updated = scrape_student(student, scraper)
-                
-                if was_updated:
-                    # Update in database
-                    students_collection.update_one(
-                        {'_id': student['_id']},
-                        {'$set': {
-                            'platforms': updated_student['platforms'],
-                            'lastScrapedAt': updated_student['lastScrapedAt']
-                        }}
-                    )
-                    updated_count += 1
-                    print(f"✅ Updated in database")
-                else:
-                    print(f"⚠️  No data to update")
-                
-            except Exception as e:
-                print(f"❌ Error processing {student['name']}: {str(e)}")
-                failed_count += 1
-            
-            # Progress indicator
-            if index < total_students:
-                print(f"\n⏳ Progress: {index}/{total_students} ({(index/total_students)*100:.1f}%)")
-                time.sleep(1)  # Small delay between students
+        # Scrape all students concurrently
+        start_time = time.time()
+        writer = BulkWriter(students_collection)
+        snapshots = SnapshotStore(db)
+        updated_count, failed_count = asyncio.run(scrape_roster(plan, writer, scraper, cadence, snapshots))
+        write_totals = writer.close()
+        snapshot_totals = snapshots.close()
+        
+        # Fold the new snapshots into weeklyProgress / last-week stats
+        WeeklyRollup(db, snapshots).run()
+        # Downsample history past the raw window (a no-op when nothing aged out)
+        SnapshotRetention(db, snapshots).run()
+        # Codolio figures from the other platforms for students without a working Codolio profile
+        derived_count, _, _ = run_aggregate(db)
+        elapsed = time.time() - start_time
         
         # Final statistics
         print(f"\n{'='*60}")
@@ -187,11 +270,17 @@ def main():
         print(f"{'='*60}")
         print(f"✅ Successfully updated: {updated_count}/{total_students}")
         print(f"❌ Failed: {failed_count}/{total_students}")
-        print(f"⏱️  Total time: ~{(total_students * SCRAPING_DELAY * 5) / 60:.1f} minutes")
+        print(f"💾 Database writes: {write_totals['operations']} in {write_totals['batches']} batches ({write_totals['errors']} errors)")
+        print(f"📈 History snapshots: {snapshot_totals['operations']} ({snapshot_totals['errors']} errors)")
+        print(f"🧮 Codolio data derived from other platforms: {derived_count} students")
+        print(f"⏱️  Total time: {elapsed / 60:.1f} minutes")
+        print(f"♻️  Unchanged GitHub profiles (304): {scraper.validator_cache.hits}")
+        if scraper.breaker.tripped:
+            print(f"🔴 Circuits opened: {', '.join(sorted(scraper.breaker.tripped))} ({scraper.breaker.rejected} requests skipped)")
         print(f"{'='*60}\n")
         
         client.close()
-        
+    
     except Exception as e:
         print(f"\n❌ Fatal error: {str(e)}")
         import traceback
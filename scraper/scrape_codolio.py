@@ -1,6 +1,8 @@
 """
 Codolio Scraper - Fetch Total Active Days and Total Contests
-Uses Selenium for JavaScript-rendered content
+Profiles come from Codolio's JSON endpoints first (codolio_api); Selenium,
+with a pool of headless browsers working in parallel, only renders the
+pages the endpoints could not answer
 """
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -8,16 +10,56 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import time
 import os
 from pymongo import MongoClient
 from dotenv import load_dotenv
 from datetime import datetime
+from bulk_writer import BulkWriter
+from driver_pool import DriverPool, DEFAULT_WORKERS
+from rate_limiter import default_limiter
+from http_transport import HttpTransport
+from codolio_api import fetch_codolio_profile, CODOLIO_API_URLS
+from delta import with_digests
 
 load_dotenv()
 
 MONGO_URI = os.getenv('MONGO_URI', 'mongodb://localhost:27017/go-tracker')
 
+# Longest wait for a profile's stats to render (override with CODOLIO_PAGE_TIMEOUT)
+PAGE_TIMEOUT = int(os.getenv('CODOLIO_PAGE_TIMEOUT', 15))
+
+# Lean page loads: skip images, fonts, stylesheets and trackers (disable with CODOLIO_LEAN_PAGES=0)
+LEAN_PAGES = os.getenv('CODOLIO_LEAN_PAGES', '1') != '0'
+
+# Persistent browser cache, one directory per pool slot (override with CODOLIO_CACHE_DIR)
+BROWSER_CACHE_DIR = os.getenv('CODOLIO_CACHE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.codolio_cache'))
+BROWSER_CACHE_BYTES = 200 * 1024 * 1024
+
+# Requests the stats never need. Blocking a download keeps the <img> element
+# and its src attribute in the DOM, so badges are still read as before.
+BLOCKED_URLS = [
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg', '*.ico',
+    '*.woff', '*.woff2', '*.ttf', '*.otf', '*.css',
+    '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*', '*clarity.ms*', '*hotjar.com*'
+]
+
+LEAN_FLAGS = [
+    '--blink-settings=imagesEnabled=false',
+    '--disable-extensions',
+    '--disable-background-networking',
+    '--disable-component-update',
+    '--disable-default-apps',
+    '--disable-sync',
+    '--mute-audio',
+    '--no-first-run'
+]
+
+ACTIVE_DAYS_XPATH = "//div[contains(text(), 'Total Active Days')]/following-sibling::span"
+CONTESTS_XPATH = "//div[contains(text(), 'Total Contests')]/following-sibling::span"
+
 # All 63 Codolio usernames (extracted from student data)
 CODOLIO_USERNAMES = [
     "Aadhamsharief_@05", "Aaruuu", "abinaya rajkumar", "Abinaya R",
@@ -36,8 +78,16 @@ CODOLIO_USERNAMES = [
     "Nishanth"
 ]
 
-def setup_driver():
-    """Setup Chrome driver with headless mode"""
+def block_requests(driver):
+    """Drop BLOCKED_URLS at the network layer through DevTools (Chrome only)"""
+    try:
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_URLS})
+    except Exception as e:
+        print(f"⚠️ Could not block page resources: {str(e)[:50]}")
+
+def setup_driver(slot=None):
+    """Setup Chrome driver with headless mode (lean pages and a cache per pool slot)"""
     chrome_options = Options()
     chrome_options.add_argument('--headless')
     chrome_options.add_argument('--no-sandbox')
@@ -46,14 +96,44 @@ def setup_driver():
     chrome_options.add_argument('--window-size=1920,1080')
     chrome_options.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
     
+    if LEAN_PAGES:
+        # Stats are waited for explicitly, so don't also wait for every subresource
+        chrome_options.page_load_strategy = 'eager'
+        for flag in LEAN_FLAGS:
+            chrome_options.add_argument(flag)
+        chrome_options.add_experimental_option('prefs', {
+            'profile.managed_default_content_settings.images': 2,
+            'profile.default_content_setting_values.notifications': 2
+        })
+    
+    if slot is not None:
+        # JS bundles come from disk on later pages and later runs; live browsers never share a directory
+        cache_dir = os.path.join(BROWSER_CACHE_DIR, f'slot-{slot}')
+        os.makedirs(cache_dir, exist_ok=True)
+        chrome_options.add_argument(f'--disk-cache-dir={cache_dir}')
+        chrome_options.add_argument(f'--disk-cache-size={BROWSER_CACHE_BYTES}')
+    
     try:
         driver = webdriver.Chrome(options=chrome_options)
+        if LEAN_PAGES:
+            block_requests(driver)
         return driver
     except Exception as e:
         print(f"❌ Error setting up Chrome driver: {e}")
         print("💡 Make sure Chrome and ChromeDriver are installed")
         return None
 
+def wait_for_stats(driver, timeout=PAGE_TIMEOUT):
+    """Wait until the active days or contests figure has rendered (False on timeout)"""
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=0.2).until(EC.any_of(
+            EC.presence_of_element_located((By.XPATH, ACTIVE_DAYS_XPATH)),
+            EC.presence_of_element_located((By.XPATH, CONTESTS_XPATH))
+        ))
+        return True
+    except TimeoutException:
+        return False
+
 def scrape_codolio_profile(driver, username):
     """Scrape Codolio profile for active days and contests"""
     if not username or username == "":
@@ -61,16 +141,18 @@ def scrape_codolio_profile(driver, username):
     
     try:
         url = f"https://codolio.com/profile/{username}"
+        default_limiter.acquire(url)
         driver.get(url)
         
-        # Wait for page to load
-        time.sleep(3)
+        # Wait for the stats to render rather than a fixed time
+        if not wait_for_stats(driver):
+            print(f"    ⚠️ {username}: stats did not render within {PAGE_TIMEOUT}s")
         
         # Try to find Total Active Days
         total_active_days = 0
         try:
             # Look for the element with "Total Active Days" text
-            active_days_element = driver.find_element(By.XPATH, "//div[contains(text(), 'Total Active Days')]/following-sibling::span")
+            active_days_element = driver.find_element(By.XPATH, ACTIVE_DAYS_XPATH)
             total_active_days = int(active_days_element.text)
         except:
             try:
@@ -84,7 +166,7 @@ def scrape_codolio_profile(driver, username):
         total_contests = 0
         try:
             # Look for the element with "Total Contests" text
-            contests_element = driver.find_element(By.XPATH, "//div[contains(text(), 'Total Contests')]/following-sibling::span")
+            contests_element = driver.find_element(By.XPATH, CONTESTS_XPATH)
             total_contests = int(contests_element.text)
         except:
             try:
@@ -150,11 +232,60 @@ def scrape_codolio_profile(driver, username):
             'lastUpdated': datetime.now()
         }
         
+    except WebDriverException:
+        # Let the pool replace a browser that broke
+        raise
     except Exception as e:
         print(f"    ❌ Error: {str(e)[:50]}")
         return None
 
-def scrape_all_codolio():
+def scrape_with_pool(pool, username):
+    """Scrape one profile on a driver borrowed from the pool"""
+    with pool.driver() as driver:
+        return scrape_codolio_profile(driver, username)
+
+def fetch_from_api(usernames):
+    """{username: result} for every profile the JSON endpoints answered"""
+    results = {}
+    if not CODOLIO_API_URLS:
+        return results
+    transport = HttpTransport()
+    try:
+        for username in usernames:
+            data = fetch_codolio_profile(username, transport)
+            if data:
+                results[username] = data
+    finally:
+        transport.close()
+    return results
+
+def scraped_profiles(usernames, workers):
+    """(username, result or None) for each profile - JSON endpoints first, browsers for the rest"""
+    api_results = fetch_from_api(usernames)
+    print(f"⚡ {len(api_results)}/{len(usernames)} profiles from the JSON endpoints")
+    for username, data in api_results.items():
+        yield username, data
+    
+    remaining = [username for username in usernames if username not in api_results]
+    if not remaining:
+        return
+    
+    # Headless browsers shared by the worker threads (started only when needed)
+    print(f"🌐 Starting up to {workers} Chrome drivers for {len(remaining)} profiles...")
+    pool = DriverPool(setup_driver, size=workers)
+    start_time = time.time()
+    with pool, ThreadPoolExecutor(max_workers=pool.size) as executor:
+        futures = {executor.submit(scrape_with_pool, pool, username): username for username in remaining}
+        for future in as_completed(futures):
+            try:
+                data = future.result()
+            except Exception as e:
+                print(f"    ❌ {futures[future]}: {str(e)[:50]}")
+                data = None
+            yield futures[future], data
+    print(f"\n⏱️  {len(remaining)} pages in {time.time() - start_time:.0f}s with {pool.size} browsers ({pool.recycled} recycled)")
+
+def scrape_all_codolio(workers=DEFAULT_WORKERS):
     """Scrape Codolio data for all 63 students"""
     
     print("\n" + "="*70)
@@ -171,48 +302,42 @@ def scrape_all_codolio():
         
         print("✅ Connected to MongoDB")
         
-        # Setup Selenium driver
-        print("🌐 Setting up Chrome driver...")
-        driver = setup_driver()
-        
-        if not driver:
-            print("❌ Failed to setup Chrome driver")
-            return
-        
-        print("✅ Chrome driver ready\n")
-        
         results = []
         updated_count = 0
         failed_count = 0
+        writer = BulkWriter(students_collection)
+        start_time = time.time()
         
         print(f"🔄 Starting Codolio scraping...")
         print(f"{'='*70}\n")
         
-        for index, username in enumerate(CODOLIO_USERNAMES, 1):
-            if not username or username == "":
-                print(f"[{index}/{len(CODOLIO_USERNAMES)}] ⚠️ No username")
-                failed_count += 1
-                continue
+        usernames = [username for username in CODOLIO_USERNAMES if username]
+        failed_count += len(CODOLIO_USERNAMES) - len(usernames)
+        if failed_count:
+            print(f"⚠️ {failed_count} students have no Codolio username")
             
-            print(f"[{index}/{len(CODOLIO_USERNAMES)}] {username}")
+        for index, (username, data) in enumerate(scraped_profiles(usernames, workers), 1):
+            print(f"[{index}/{len(usernames)}] {username}")
             
             try:
-                data = scrape_codolio_profile(driver, username)
-                
                 if data and (data['totalActiveDays'] > 0 or data['totalContests'] > 0):
                     results.append(data)
                     
                     # Update MongoDB
-                    students_collection.update_one(
-                        {'platformUsernames.codolio': username},
-                        {'$set': {
-                            'platforms.codolio.totalActiveDays': data['totalActiveDays'],
-                            'platforms.codolio.totalContests': data['totalContests'],
-                            'platforms.codolio.totalSubmissions': data['totalSubmissions'],
-                            'platforms.codolio.badges': data.get('badges', []),
-                            'platforms.codolio.lastUpdated': datetime.now()
-                        }}
-                    )
+                    values = {
+                        'totalActiveDays': data['totalActiveDays'],
+                        'totalContests': data['totalContests'],
+                        'totalSubmissions': data['totalSubmissions'],
+                        'badges': data.get('badges', []),
+                        'source': 'codolio',
+                        'lastUpdated': datetime.now()
+                    }
+                    # Only the JSON endpoints carry the heatmap and streaks
+                    for field in ('dailySubmissions', 'currentStreak', 'maxStreak'):
+                        if field in data:
+                            values[field] = data[field]
+                    update_data = with_digests('platforms.codolio', values)
+                    writer.update_one({'platformUsernames.codolio': username}, {'$set': update_data})
                     
                     updated_count += 1
                     badge_count = len(data.get('badges', []))
@@ -225,11 +350,8 @@ def scrape_all_codolio():
                 print(f"    ❌ Error: {str(e)[:50]}")
                 failed_count += 1
             
-            # Small delay between requests
-            time.sleep(2)
-        
-        # Close driver
-        driver.quit()
+        writer.close()
+        print(f"\n⏱️  {len(usernames)} profiles in {time.time() - start_time:.0f}s")
         
         # Save results
         import json
@@ -1,24 +1,33 @@
 """
-GitHub Streak Scraper - Parse contribution calendar from HTML
-Fetches streak data for all 63 students
+GitHub Streak Scraper - Streaks plus profile activity for all students
+Streaks come from exact GraphQL contribution calendars (github_calendar);
+the profile page HTML adds activity items, and its estimated calendar is
+only used when the exact one is unavailable
 """
 import requests
-from bs4 import BeautifulSoup
 from datetime import datetime, timedelta
 import json
-import time
 import re
 import os
 from pymongo import MongoClient
 from dotenv import load_dotenv
+from rate_limiter import default_limiter
+from html_parser import parse_html
+from bulk_writer import BulkWriter
+from roster import iter_roster, count_roster
+from github_calendar import fetch_streaks, compute_streaks, streak_fields, CalendarCache, ensure_calendar_collection
 
 load_dotenv()
 
 MONGO_URI = os.getenv('MONGO_URI', 'mongodb://localhost:27017/go-tracker')
 
+TOTAL_CONTRIBUTIONS_PATTERN = re.compile(r'([\d,]+)\s+contribution')
+ACTIVITY_KEYWORDS = ('commit', 'pull request', 'issue', 'repository', 'review')
+
 def scrape_profile_page(username, session=None):
     """Scrape contribution data from GitHub profile page HTML"""
     url = f"https://github.com/{username}"
+    default_limiter.acquire(url)
     
     if session:
         response = session.get(url)
@@ -29,10 +38,10 @@ def scrape_profile_page(username, session=None):
         print(f"    ❌ Error: Could not fetch profile for {username}")
         return None
     
-    soup = BeautifulSoup(response.text, 'html.parser')
+    doc = parse_html(response.text)
     
     # Find the contribution graph SVG
-    contribution_graph = soup.find('svg', class_='js-calendar-graph-svg')
+    contribution_graph = doc.select_one('svg.js-calendar-graph-svg')
     
     if not contribution_graph:
         print(f"    ⚠️ Warning: Could not find contribution graph for {username}")
@@ -40,11 +49,11 @@ def scrape_profile_page(username, session=None):
     
     # Extract contribution data from the SVG rects
     contributions = []
-    rects = contribution_graph.find_all('rect')
+    rects = contribution_graph.select('rect')
     
     for rect in rects:
-        date_str = rect.get('data-date')
-        level_str = rect.get('data-level')  # 0-4 intensity level
+        date_str = rect.attr('data-date')
+        level_str = rect.attr('data-level')  # 0-4 intensity level
         
         if date_str and level_str is not None:
             try:
@@ -74,44 +83,46 @@ def scrape_profile_page(username, session=None):
     
     # Try to get total contributions from the h2 tag
     total_contributions = 0
-    contribution_text = soup.find('h2', class_='f4 text-normal mb-2')
+    contribution_text = doc.select_one('h2.f4.text-normal.mb-2')
     
     if contribution_text:
         # Look for pattern like "1,234 contributions in the last year"
-        text = contribution_text.get_text()
-        match = re.search(r'([\d,]+)\s+contribution', text)
+        match = TOTAL_CONTRIBUTIONS_PATTERN.search(contribution_text.text())
         if match:
             total_contributions = int(match.group(1).replace(',', ''))
     
     # Scrape "Contribution activity" section
     activity_data = {}
-    activity_section = soup.find('h2', class_='f4 text-normal mt-4 mb-3', string=re.compile('Contribution activity'))
+    activity_section = next(
+        (h2 for h2 in doc.select('h2.f4.text-normal.mt-4.mb-3') if 'Contribution activity' in h2.text()),
+        None
+    )
     
     if activity_section:
         # Find the parent container
-        activity_container = activity_section.find_parent('div')
+        activity_container = activity_section.ancestor('div')
         
         if activity_container:
             # Extract activity items
             activity_items = []
             
             # Look for activity entries (commits, PRs, issues, etc.)
-            activity_list = activity_container.find_all('div', class_='contribution-activity-listing')
+            activity_list = activity_container.select('div.contribution-activity-listing')
             
             for item in activity_list:
                 try:
                     # Extract text content
-                    text = item.get_text(strip=True)
+                    text = item.text(strip=True)
                     activity_items.append(text)
                 except:
                     continue
             
             # Also try to find summary text
-            summary_divs = activity_container.find_all('div', recursive=True)
+            summary_divs = activity_container.select('div')
             for div in summary_divs:
-                text = div.get_text(strip=True)
+                text = div.text(strip=True)
                 # Look for patterns like "Created 5 commits", "Opened 3 pull requests"
-                if any(keyword in text.lower() for keyword in ['commit', 'pull request', 'issue', 'repository', 'review']):
+                if any(keyword in text.lower() for keyword in ACTIVITY_KEYWORDS):
                     if text and len(text) < 200:  # Avoid long text blocks
                         activity_items.append(text)
             
@@ -125,46 +136,11 @@ def scrape_profile_page(username, session=None):
     }
 
 def calculate_streaks_from_html(data):
-    """Calculate streaks from HTML-scraped data"""
+    """Calculate streaks from HTML-scraped data (estimated counts - fallback only)"""
     if not data or not data['contributions']:
         return None
     
-    contributions = sorted(data['contributions'], key=lambda x: x['date'])
-    today = datetime.now().date()
-    
-    # Calculate current streak (working backwards from today)
-    current_streak = 0
-    for i in range(len(contributions) - 1, -1, -1):
-        day_date = contributions[i]['date'].date()
-        
-        if day_date > today:
-            continue
-        
-        if contributions[i]['count'] > 0:
-            current_streak += 1
-        else:
-            # Allow one day gap for "today" if no contributions yet
-            if current_streak == 0 and (today - day_date).days <= 1:
-                continue
-            else:
-                break
-    
-    # Calculate longest streak
-    longest_streak = 0
-    temp_streak = 0
-    
-    for day in contributions:
-        if day['count'] > 0:
-            temp_streak += 1
-            longest_streak = max(longest_streak, temp_streak)
-        else:
-            temp_streak = 0
-    
-    return {
-        'total_contributions': data['total_contributions'],
-        'current_streak': current_streak,
-        'longest_streak': longest_streak
-    }
+    return compute_streaks(data['contributions'], data['total_contributions'])
 
 def scrape_github_streaks_for_students():
     """Scrape GitHub streaks for all 63 students from MongoDB"""
@@ -183,8 +159,15 @@ def scrape_github_streaks_for_students():
         print("✅ Connected to MongoDB")
         
         # Get all active students with GitHub usernames
-        students = list(students_collection.find({'isActive': True}))
-        print(f"📊 Found {len(students)} active students")
+        total_students = count_roster(students_collection)
+        students = list(iter_roster(students_collection))
+        print(f"📊 Found {total_students} active students")
+        
+        # Exact all-time calendars for everyone, many users per request
+        streaks = fetch_streaks(
+            (s.get('platformUsernames', {}).get('github', '') for s in students),
+            cache=CalendarCache(ensure_calendar_collection(db))
+        )
         
         # Create session with user agent
         session = requests.Session()
@@ -195,79 +178,72 @@ def scrape_github_streaks_for_students():
         results = []
         updated_count = 0
         failed_count = 0
+        writer = BulkWriter(students_collection)
         
         print(f"\n🔄 Starting streak scraping...")
-        print(f"⏱️  Delay between requests: 2 seconds")
         print(f"{'='*60}\n")
         
         for index, student in enumerate(students, 1):
             github_username = student.get('platformUsernames', {}).get('github', '')
             
             if not github_username:
-                print(f"[{index}/{len(students)}] {student['name']}: ⚠️ No GitHub username")
+                print(f"[{index}/{total_students}] {student['name']}: ⚠️ No GitHub username")
                 continue
             
-            print(f"[{index}/{len(students)}] {student['name']}")
+            print(f"[{index}/{total_students}] {student['name']}")
             print(f"  🔍 GitHub: {github_username}")
             
             try:
-                # Scrape profile page
-                data = scrape_profile_page(github_username, session)
+                # Scrape profile page (activity, and fallback calendar)
+                data = scrape_profile_page(github_username, session) or {}
+                streak_info = streaks.get(github_username)
                 
-                if data and data['contributions']:
-                    # Calculate streaks
+                if streak_info is None and data.get('contributions'):
+                    print(f"    ⚠️ No exact calendar - estimating from the profile page")
                     streak_info = calculate_streaks_from_html(data)
                     
-                    if streak_info:
-                        result = {
-                            'username': github_username,
-                            'total_contributions': streak_info['total_contributions'],
-                            'current_streak': streak_info['current_streak'],
-                            'longest_streak': streak_info['longest_streak'],
-                            'activity_data': data.get('activity_data', {}),
-                            'scraped_at': datetime.now()
-                        }
+                if streak_info:
+                    result = {
+                        'username': github_username,
+                        'total_contributions': streak_info['total_contributions'],
+                        'current_streak': streak_info['current_streak'],
+                        'longest_streak': streak_info['longest_streak'],
+                        'activity_data': data.get('activity_data', {}),
+                        'scraped_at': datetime.now()
+                    }
                         
-                        results.append(result)
+                    results.append(result)
                         
-                        # Update MongoDB with streak and activity data
-                        update_data = {
-                            'platforms.github.streak': streak_info['current_streak'],
-                            'platforms.github.longestStreak': streak_info['longest_streak'],
-                            'platforms.github.lastUpdated': datetime.now()
-                        }
+                    # Update MongoDB with streak and activity data
+                    update_data = streak_fields(streak_info)
+                    update_data['platforms.github.lastUpdated'] = datetime.now()
                         
-                        # Add activity data if available
-                        if data.get('activity_data', {}).get('has_activity'):
-                            update_data['platforms.github.activityItems'] = data['activity_data'].get('activity_items', [])
+                    # Add activity data if available
+                    if data.get('activity_data', {}).get('has_activity'):
+                        update_data['platforms.github.activityItems'] = data['activity_data'].get('activity_items', [])
                         
-                        students_collection.update_one(
-                            {'_id': student['_id']},
-                            {'$set': update_data}
-                        )
+                    writer.update_one(
+                        {'_id': student['_id']},
+                        {'$set': update_data}
+                    )
                         
-                        updated_count += 1
-                        print(f"    ✅ Current: {streak_info['current_streak']} days, Longest: {streak_info['longest_streak']} days")
-                        print(f"    📊 Total contributions: {streak_info['total_contributions']}")
+                    updated_count += 1
+                    print(f"    ✅ Current: {streak_info['current_streak']} days, Longest: {streak_info['longest_streak']} days")
+                    print(f"    📊 Total contributions: {streak_info['total_contributions']}")
                         
-                        # Show activity summary if available
-                        if data.get('activity_data', {}).get('has_activity'):
-                            activity_count = len(data['activity_data'].get('activity_items', []))
-                            print(f"    🎯 Activity items found: {activity_count}")
-                    else:
-                        print(f"    ❌ Could not calculate streaks")
-                        failed_count += 1
+                    # Show activity summary if available
+                    if data.get('activity_data', {}).get('has_activity'):
+                        activity_count = len(data['activity_data'].get('activity_items', []))
+                        print(f"    🎯 Activity items found: {activity_count}")
                 else:
                     print(f"    ❌ No contribution data found")
                     failed_count += 1
-                    
+            
             except Exception as e:
                 print(f"    ❌ Error: {e}")
                 failed_count += 1
-            
-            # Be respectful - don't hammer GitHub
-            if index < len(students):
-                time.sleep(2)  # 2 seconds between requests
+        
+        writer.close()
         
         # Save results to JSON file
         output_file = 'github_streaks_results.json'
@@ -278,8 +254,8 @@ def scrape_github_streaks_for_students():
         print(f"\n{'='*60}")
         print("📊 STREAK SCRAPING COMPLETE!")
         print(f"{'='*60}")
-        print(f"✅ Successfully updated: {updated_count}/{len(students)}")
-        print(f"❌ Failed: {failed_count}/{len(students)}")
+        print(f"✅ Successfully updated: {updated_count}/{total_students}")
+        print(f"❌ Failed: {failed_count}/{total_students}")
         print(f"💾 Results saved to: {output_file}")
         
         # Print summary
@@ -317,7 +293,7 @@ def scrape_github_streaks_for_students():
         print(f"\n{'='*60}\n")
         
         client.close()
-        
+    
     except Exception as e:
         print(f"\n❌ Fatal error: {str(e)}")
         import traceback
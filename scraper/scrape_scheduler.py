@@ -0,0 +1,112 @@
+"""
+Scrape Scheduler - Only fetch what has gone stale
+Every (student, platform) pair is checked against its platform's TTL
+using platforms.<name>.lastUpdated, whichever script wrote it. Due items
+go into a priority queue, most overdue first, so a run right after
+another one fetches next to nothing. With a CadenceModel, each pair's
+learned interval replaces the platform TTL.
+"""
+import heapq
+import os
+from datetime import datetime
+from platforms import PLATFORMS
+
+# platform: minutes before stored data is due again (override with e.g. LEETCODE_TTL_MINUTES=60)
+PLATFORM_TTLS = {
+    'leetcode': int(os.getenv('LEETCODE_TTL_MINUTES', 360)),
+    'codechef': int(os.getenv('CODECHEF_TTL_MINUTES', 720)),
+    'codeforces': int(os.getenv('CODEFORCES_TTL_MINUTES', 360)),
+    'github': int(os.getenv('GITHUB_TTL_MINUTES', 360)),
+    'codolio': int(os.getenv('CODOLIO_TTL_MINUTES', 1440))
+}
+
+# FORCE_SCRAPE=1 makes everything due (e.g. after changing a parser)
+FORCE_SCRAPE = os.getenv('FORCE_SCRAPE', '').lower() in ('1', 'true', 'yes')
+
+def last_updated(student, platform):
+    """When a platform was last refreshed for a student (None if never)"""
+    data = (student.get('platforms') or {}).get(platform) or {}
+    value = data.get('lastUpdated')
+    return value if isinstance(value, datetime) else None
+
+def handle_changed(student, platform):
+    """True if the stored data belongs to a different username than the current one"""
+    data = (student.get('platforms') or {}).get(platform) or {}
+    stored = data.get('username')
+    return bool(stored) and stored != student.get('platformUsernames', {}).get(platform)
+
+class ScrapeScheduler:
+    """Builds the queue of (student, platform) items that are due"""
+    
+    def __init__(self, ttls=None, force=FORCE_SCRAPE, cadence=None):
+        # ttls: platform -> minutes
+        self.ttls = {**PLATFORM_TTLS, **(ttls or {})}
+        self.force = force
+        # Optional CadenceModel with learned per-student intervals
+        self.cadence = cadence
+    
+    def ttl_for(self, student, platform):
+        """Seconds a platform's data stays fresh for this student"""
+        if self.cadence is not None:
+            minutes = self.cadence.interval_for(student, platform)
+            if minutes is not None:
+                return minutes * 60
+        return self.ttls[platform] * 60
+    
+    def last_refreshed(self, student, platform):
+        """
+        Latest of the stored lastUpdated and the cadence model's last check -
+        unchanged results are not written back, so only the model sees them.
+        """
+        updated = last_updated(student, platform)
+        checked = self.cadence.last_checked(student, platform) if self.cadence is not None else None
+        if updated is None or (checked is not None and checked > updated):
+            return checked
+        return updated
+    
+    def overdue(self, student, platform, now):
+        """
+        How overdue an item is, in TTLs (1.0 = exactly one TTL old).
+        Never-scraped items and changed handles are infinitely overdue.
+        """
+        updated = self.last_refreshed(student, platform)
+        if updated is None or handle_changed(student, platform):
+            return float('inf')
+        ttl = self.ttl_for(student, platform)
+        if ttl <= 0:
+            return float('inf')
+        return (now - updated).total_seconds() / ttl
+    
+    def due_items(self, students, now=None):
+        """
+        Due (student, platform) pairs, most overdue first.
+        `students` can be any iterable (e.g. a roster cursor); only due
+        students are kept.
+        """
+        now = now or datetime.now()
+        queue = []
+        for index, student in enumerate(students):
+            usernames = student.get('platformUsernames') or {}
+            for platform in PLATFORMS:
+                if not usernames.get(platform):
+                    continue
+                overdue = float('inf') if self.force else self.overdue(student, platform, now)
+                if overdue >= 1.0:
+                    heapq.heappush(queue, (-overdue, index, platform, student))
+        
+        while queue:
+            _, _, platform, student = heapq.heappop(queue)
+            yield student, platform
+    
+    def plan(self, students, now=None):
+        """
+        Group due items by student.
+        Returns [(student, [platforms])], ordered by each student's most overdue item.
+        """
+        plan = {}
+        for student, platform in self.due_items(students, now):
+            key = id(student)
+            if key not in plan:
+                plan[key] = (student, [])
+            plan[key][1].append(platform)
+        return list(plan.values())
@@ -0,0 +1,212 @@
+"""
+Snapshot Retention - Downsample old stats history so it stays bounded
+Raw per-scrape points are kept for RAW_RETENTION_DAYS, then folded into
+one daily aggregate per (student, platform, day); daily aggregates older
+than DAILY_RETENTION_DAYS are folded into weekly ones, kept for good.
+Each aggregate keeps last/min/max of every stats field. Periods are
+compacted one at a time and merged with $min/$max, so a run can stop
+anywhere and simply be run again.
+Time-series collections only take deletes filtered on their metaField
+(MongoDB 5.0/6.x), so there raw points are expired by the server
+(expireAfterSeconds) and compaction just tracks how far it has got.
+"""
+import os
+from datetime import datetime, timedelta
+from pymongo import MongoClient, UpdateOne, ASCENDING, DESCENDING
+from pymongo.errors import OperationFailure
+from dotenv import load_dotenv
+from snapshot_store import SnapshotStore, SNAPSHOT_FIELDS, AGGREGATE_COLLECTIONS
+from weekly_rollup import week_start, ROLLUP_STATE_COLLECTION
+
+load_dotenv()
+
+MONGO_URI = os.getenv('MONGO_URI', 'mongodb://localhost:27017/go-tracker')
+
+# Keep raw points at least two weeks - the weekly rollup reads them
+RAW_RETENTION_DAYS = max(14, int(os.getenv('SNAPSHOT_RAW_DAYS', 30)))
+DAILY_RETENTION_DAYS = int(os.getenv('SNAPSHOT_DAILY_DAYS', 365))
+
+# Raw time-series points expire this long after compaction would first fold them
+EXPIRY_MARGIN_DAYS = 7
+
+# State document with how far raw points have been compacted (time-series only)
+RETENTION_STATE_ID = 'snapshotRetention'
+
+def day_start(when):
+    """Midnight of the day containing `when`"""
+    return when.replace(hour=0, minute=0, second=0, microsecond=0)
+
+def next_day(start):
+    """Start of the following day"""
+    return start + timedelta(days=1)
+
+def next_week(start):
+    """Start of the following week"""
+    return start + timedelta(days=7)
+
+def summarize(points, fields=SNAPSHOT_FIELDS):
+    """
+    {(student, platform): aggregate} for raw points or finer aggregates.
+    Each field gets last/min/max; `lastTs` is when `last` was seen.
+    """
+    summaries = {}
+    for point in points:
+        meta = point['meta']
+        seen = point.get('lastTs', point['ts'])
+        summary = summaries.setdefault((meta['studentId'], meta['platform']), {'lastTs': seen})
+        newest = seen >= summary['lastTs']
+        summary['lastTs'] = max(seen, summary['lastTs'])
+        for field in fields:
+            value = point.get(field)
+            if value is None:
+                continue
+            if not isinstance(value, dict):
+                value = {'last': value, 'min': value, 'max': value}
+            stats = summary.setdefault(field, dict(value))
+            stats['min'] = min(stats['min'], value['min'])
+            stats['max'] = max(stats['max'], value['max'])
+            if newest:
+                stats['last'] = value['last']
+    return summaries
+
+def merge_operation(student_id, platform, period, summary, fields=SNAPSHOT_FIELDS):
+    """
+    Upsert folding `summary` into the stored aggregate for one period.
+    Re-applying the same summary leaves the aggregate unchanged.
+    """
+    newer = {'$gte': [summary['lastTs'], {'$ifNull': ['$lastTs', datetime.min]}]}
+    merged = {
+        'meta': {'studentId': student_id, 'platform': platform},
+        'ts': period,
+        'lastTs': {'$max': ['$lastTs', summary['lastTs']]}
+    }
+    for field in fields:
+        if field not in summary:
+            continue
+        stats = summary[field]
+        merged[field] = {
+            'last': {'$cond': [newer, stats['last'], f'${field}.last']},
+            'min': {'$min': [f'${field}.min', stats['min']]},
+            'max': {'$max': [f'${field}.max', stats['max']]}
+        }
+    return UpdateOne(
+        {'_id': {'studentId': student_id, 'platform': platform, 'period': period}},
+        [{'$set': merged}],
+        upsert=True
+    )
+
+def ensure_aggregate_indexes(collection):
+    """Indexes for point-in-time lookups and the period scans here"""
+    collection.create_index(
+        [('meta.studentId', ASCENDING), ('meta.platform', ASCENDING), ('lastTs', DESCENDING)],
+        name='meta_lastTs'
+    )
+    collection.create_index([('ts', ASCENDING)], name='ts')
+
+def is_timeseries(db, name):
+    """True if `name` is a time-series collection"""
+    for info in db.list_collections(filter={'name': name}):
+        return info.get('type') == 'timeseries'
+    return False
+
+def ensure_raw_expiry(db, name, days):
+    """Have the server expire raw points older than `days` (True if it will)"""
+    try:
+        db.command('collMod', name, expireAfterSeconds=int(days * 24 * 3600))
+        return True
+    except OperationFailure as e:
+        print(f"⚠️ Could not set snapshot expiry on {name}: {e}")
+        return False
+
+class SnapshotRetention:
+    """Compacts raw points into daily aggregates, and daily into weekly"""
+    
+    def __init__(self, db, snapshots=None, raw_days=RAW_RETENTION_DAYS, daily_days=DAILY_RETENTION_DAYS, verbose=True):
+        self.snapshots = snapshots or SnapshotStore(db)
+        self.raw = self.snapshots.collection
+        self.daily, self.weekly = (db[name] for name in AGGREGATE_COLLECTIONS)
+        self.state = db[ROLLUP_STATE_COLLECTION]
+        self.raw_days = raw_days
+        self.daily_days = daily_days
+        self.verbose = verbose
+        for collection in (self.daily, self.weekly):
+            ensure_aggregate_indexes(collection)
+        # Raw points are never deleted here when the server expires them
+        self.raw_expires = is_timeseries(db, self.raw.name) and ensure_raw_expiry(db, self.raw.name, raw_days + EXPIRY_MARGIN_DAYS)
+    
+    def oldest(self, collection, before, since=None):
+        """Earliest `ts` in [since, before) (None if there is nothing to compact)"""
+        window = {'$lt': before, **({'$gte': since} if since else {})}
+        point = collection.find_one({'ts': window}, {'ts': 1}, sort=[('ts', ASCENDING)])
+        return point['ts'] if point else None
+    
+    def raw_watermark(self):
+        """Where compaction of expiring raw points stopped last time (None on the first run)"""
+        state = self.state.find_one({'_id': RETENTION_STATE_ID})
+        return state.get('rawCompactedUntil') if state else None
+    
+    def compact(self, source, target, cutoff, period_of, next_period, since=None, delete=True):
+        """
+        Fold every whole period of `source` in [since, cutoff) into `target`, oldest first.
+        With `delete`, source documents are deleted only after their period is merged.
+        Returns (periods, source documents) compacted.
+        """
+        periods = documents = 0
+        cutoff = period_of(cutoff)
+        oldest = self.oldest(source, cutoff, since)
+        while oldest is not None:
+            start = period_of(oldest)
+            end = min(next_period(start), cutoff)
+            in_period = {'ts': {'$gte': start, '$lt': end}}
+            points = list(source.find(in_period))
+            summaries = summarize(points)
+            if summaries:
+                target.bulk_write(
+                    [merge_operation(student, platform, start, summary)
+                     for (student, platform), summary in summaries.items()],
+                    ordered=False
+                )
+            documents += source.delete_many(in_period).deleted_count if delete else len(points)
+            periods += 1
+            oldest = self.oldest(source, cutoff, end)
+        return periods, documents
+    
+    def compact_raw(self, now):
+        """Raw points -> daily aggregates (deleting them unless the server expires them)"""
+        cutoff = now - timedelta(days=self.raw_days)
+        if not self.raw_expires:
+            return self.compact(self.raw, self.daily, cutoff, day_start, next_day)
+        result = self.compact(self.raw, self.daily, cutoff, day_start, next_day, since=self.raw_watermark(), delete=False)
+        self.state.update_one(
+            {'_id': RETENTION_STATE_ID},
+            {'$set': {'rawCompactedUntil': day_start(cutoff), 'updatedAt': now}},
+            upsert=True
+        )
+        return result
+    
+    def run(self, now=None):
+        """One retention pass; returns {'daily': (days, points), 'weekly': (weeks, days)}"""
+        now = now or datetime.now()
+        result = {'daily': (0, 0), 'weekly': (0, 0)}
+        try:
+            result['daily'] = self.compact_raw(now)
+            result['weekly'] = self.compact(self.daily, self.weekly, now - timedelta(days=self.daily_days), week_start, next_week)
+        except OperationFailure as e:
+            # Compaction is resumable, so report and let the scrape finish
+            print(f"⚠️ Snapshot retention stopped early: {e}")
+        if self.verbose:
+            days, points = result['daily']
+            weeks, daily_docs = result['weekly']
+            print(f"🗜️  Snapshot retention: {points} raw points -> {days} days, {daily_docs} daily aggregates -> {weeks} weeks")
+        return result
+
+def main():
+    """Run one retention pass"""
+    client = MongoClient(MONGO_URI)
+    try:
+        SnapshotRetention(client['go-tracker']).run()
+    finally:
+        client.close()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""
+Snapshot Store - Platform stats history in a MongoDB time-series collection
+Every scrape appends one small point per (student, platform): rating,
+problems solved, contests and contributions. Points are bucketed by
+meta (student + platform) and indexed on (meta, ts), so "value N days
+ago" is a single index seek instead of a document scan.
+"""
+from datetime import datetime, timedelta
+from pymongo import DESCENDING, ASCENDING, InsertOne
+from pymongo.errors import CollectionInvalid, OperationFailure
+from bulk_writer import BulkWriter
+
+SNAPSHOT_COLLECTION = 'platformSnapshots'
+
+# Downsampled history (see snapshot_retention.py), coarsest last
+AGGREGATE_COLLECTIONS = ('platformSnapshotsDaily', 'platformSnapshotsWeekly')
+
+# Numeric fields kept per point (whichever a platform has)
+SNAPSHOT_FIELDS = ('rating', 'problemsSolved', 'contests', 'contributions')
+
+# Read from another field when a platform leaves the usual one empty
+FIELD_FALLBACKS = {'contests': 'contestsAttended'}
+
+def snapshot_document(student_id, platform, data, ts=None):
+    """One time-series point from a scrape result"""
+    point = {
+        'ts': ts or datetime.now(),
+        'meta': {'studentId': student_id, 'platform': platform}
+    }
+    for field in SNAPSHOT_FIELDS:
+        value = data.get(field) or data.get(FIELD_FALLBACKS.get(field), data.get(field))
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            point[field] = value
+    return point
+
+def ensure_snapshot_collection(db, name=SNAPSHOT_COLLECTION):
+    """Create the time-series collection and its (meta, ts) index if missing"""
+    if name not in db.list_collection_names():
+        try:
+            db.create_collection(
+                name,
+                timeseries={'timeField': 'ts', 'metaField': 'meta', 'granularity': 'hours'}
+            )
+        except CollectionInvalid:
+            pass  # Created meanwhile by another run
+        except OperationFailure as e:
+            # MongoDB < 5.0 has no time-series collections - a plain one works the same
+            print(f"⚠️ Time-series collection unavailable ({e}), using a regular collection")
+            db.create_collection(name)
+    collection = db[name]
+    collection.create_index(
+        [('meta.studentId', ASCENDING), ('meta.platform', ASCENDING), ('ts', DESCENDING)],
+        name='meta_ts'
+    )
+    # "Everything since T" scans (rollups); time-series buckets are already clustered on ts
+    collection.create_index([('ts', ASCENDING)], name='ts')
+    return collection
+
+class SnapshotStore:
+    """Appends points through a BulkWriter and answers point-in-time lookups"""
+    
+    def __init__(self, db, name=SNAPSHOT_COLLECTION, aggregates=AGGREGATE_COLLECTIONS):
+        self.collection = ensure_snapshot_collection(db, name)
+        self.aggregates = [db[aggregate] for aggregate in aggregates]
+        self.writer = None
+    
+    def append(self, student_id, platform, data, ts=None):
+        """Queue one point (written in bulk in the background); False if there is nothing to keep"""
+        point = snapshot_document(student_id, platform, data, ts)
+        if not any(field in point for field in SNAPSHOT_FIELDS):
+            return False
+        if self.writer is None:
+            self.writer = BulkWriter(self.collection, verbose=False)
+        self.writer.add(InsertOne(point))
+        return True
+    
+    def close(self):
+        """Write queued points; returns the writer totals"""
+        if self.writer is None:
+            return {'operations': 0, 'errors': 0}
+        totals = self.writer.close()
+        self.writer = None
+        return totals
+    
+    def value_at(self, student_id, platform, when, fields=SNAPSHOT_FIELDS):
+        """
+        Latest point at or before `when` (None if there is no history that old).
+        Falls back to the daily/weekly aggregates once raw points are compacted.
+        """
+        point = self.collection.find_one(
+            {'meta.studentId': student_id, 'meta.platform': platform, 'ts': {'$lte': when}},
+            {field: 1 for field in ('ts', *fields)},
+            sort=[('ts', DESCENDING)]
+        )
+        if point is not None:
+            return point
+        for aggregates in self.aggregates:
+            aggregate = aggregates.find_one(
+                {'meta.studentId': student_id, 'meta.platform': platform, 'lastTs': {'$lte': when}},
+                {field: 1 for field in ('lastTs', *fields)},
+                sort=[('lastTs', DESCENDING)]
+            )
+            if aggregate is not None:
+                point = {'ts': aggregate['lastTs']}
+                point.update({field: aggregate[field]['last'] for field in fields if isinstance(aggregate.get(field), dict)})
+                return point
+        return None
+    
+    def value_days_ago(self, student_id, platform, days, fields=SNAPSHOT_FIELDS):
+        """Latest point from at least `days` days ago"""
+        return self.value_at(student_id, platform, datetime.now() - timedelta(days=days), fields)
@@ -0,0 +1,135 @@
+"""
+Check the Codolio API client against a recorded profile payload
+The mapping, the sync client, the async scraper and the Selenium fallback
+all run against stubbed responses - no network or browser needed.
+"""
+import asyncio
+import copy
+import json
+import os
+import httpx
+from codolio_api import map_profile, fetch_codolio_profile
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'codolio_profile.json')
+
+with open(FIXTURE, encoding='utf-8') as f:
+    payload = json.load(f)
+    BODY = json.dumps(payload)
+
+class StubResponse:
+    def __init__(self, status_code, text):
+        self.status_code = status_code
+        self.text = text
+
+class StubTransport:
+    """HttpTransport stand-in: {url: (status, body) or an exception}, records the URLs asked for"""
+    
+    def __init__(self, responses):
+        self.responses = responses
+        self.requested = []
+    
+    def get(self, url, headers=None):
+        self.requested.append(url)
+        response = self.responses[url]
+        if isinstance(response, Exception):
+            raise response
+        return StubResponse(*response)
+
+def stub_response(status, body):
+    """httpx.MockTransport handler answering every Codolio API request the same way"""
+    seen = []
+    
+    def handler(request):
+        seen.append(request.url.host)
+        if request.url.host == 'api.codolio.com':
+            return httpx.Response(status, text=body)
+        return httpx.Response(200, text='<html><body>Loading...</body></html>')
+    return handler, seen
+
+print("\n" + "="*70)
+print("🧪 TESTING CODOLIO API CLIENT")
+print("="*70 + "\n")
+
+# 1. Mapping of the recorded payload
+result = map_profile('Saran@07', payload)
+
+# Overall totals, not the per-platform ones under platformProfiles
+assert result['totalActiveDays'] == 187, result['totalActiveDays']
+assert result['totalContests'] == 23, result['totalContests']
+assert result['totalSubmissions'] == 412, result['totalSubmissions']
+assert [badge['id'] for badge in result['badges']] == ['b1'], result['badges']
+assert result['dailySubmissions'] == [
+    {'date': '2025-10-16', 'count': 0},
+    {'date': '2025-10-17', 'count': 2},
+    {'date': '2025-10-18', 'count': 3}
+], result['dailySubmissions']
+print(f"   ✅ Active Days: {result['totalActiveDays']} | Contests: {result['totalContests']} | Submissions: {result['totalSubmissions']}")
+
+# A required total missing means the schema changed - fall back to Selenium
+changed = copy.deepcopy(payload)
+del changed['data']['overallStats']['totalContests']
+assert map_profile('Saran@07', changed) is None
+moved = {'data': {'profile': payload['data']}}
+assert map_profile('Saran@07', moved) is None
+print("   ✅ Missing or moved totals -> None (Selenium fallback)")
+
+# 2. fetch_codolio_profile: success, 404, malformed JSON, connection error
+urls = ['https://a.test/{username}', 'https://b.test/{username}']
+ok = StubTransport({'https://a.test/Saran%4007': (200, BODY)})
+assert fetch_codolio_profile('Saran@07', ok, urls)['totalActiveDays'] == 187
+assert ok.requested == ['https://a.test/Saran%4007'], ok.requested
+
+for label, first in (('404', (404, '{"error": "not found"}')),
+                     ('malformed JSON', (200, '<html>not json</html>')),
+                     ('connection error', ConnectionError('refused'))):
+    transport = StubTransport({'https://a.test/Saran%4007': first, 'https://b.test/Saran%4007': (404, '')})
+    assert fetch_codolio_profile('Saran@07', transport, urls) is None, label
+    # Every endpoint is tried before giving up
+    assert len(transport.requested) == 2, (label, transport.requested)
+    print(f"   ✅ {label} -> None after trying every endpoint")
+
+second = StubTransport({'https://a.test/Saran%4007': (500, ''), 'https://b.test/Saran%4007': (200, BODY)})
+assert fetch_codolio_profile('Saran@07', second, urls)['totalContests'] == 23
+print("   ✅ Falls through to the next endpoint")
+
+# 3. Async scraper: API success, and the profile page fallback on 404 / malformed JSON
+from async_scraper import AsyncPlatformScraper
+
+async def scrape_async(status, body):
+    handler, seen = stub_response(status, body)
+    async with AsyncPlatformScraper(max_retries=0) as scraper:
+        await scraper.clients['codolio'].aclose()
+        scraper.clients['codolio'] = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        return await scraper.scrape_codolio('Saran@07'), seen
+
+data, seen = asyncio.run(scrape_async(200, BODY))
+assert data['totalActiveDays'] == 187 and data['source'] == 'codolio', data
+assert seen == ['api.codolio.com'], seen
+print("   ✅ Async: profile from the JSON endpoint")
+
+for label, status, body in (('404', 404, ''), ('malformed JSON', 200, '{"data": ')):
+    data, seen = asyncio.run(scrape_async(status, body))
+    assert seen == ['api.codolio.com', 'codolio.com'], (label, seen)
+    assert data['totalActiveDays'] == 0 and data['source'] != 'codolio', (label, data)
+    print(f"   ✅ Async {label}: fell back to the profile page")
+
+# 4. scrape_codolio: profiles the API could not answer go to the browser pool
+import scrape_codolio
+
+scrape_codolio.fetch_codolio_profile = lambda username, transport: map_profile(username, payload) if username == 'Saran@07' else None
+scrape_codolio.setup_driver = lambda slot=None: object()
+browsed = []
+
+def fake_browser(pool, username):
+    browsed.append(username)
+    return {'username': username, 'totalActiveDays': 1, 'totalContests': 0, 'totalSubmissions': 0, 'badges': []}
+
+scrape_codolio.scrape_with_pool = fake_browser
+profiles = dict(scrape_codolio.scraped_profiles(['Saran@07', 'missing'], 2))
+assert profiles['Saran@07']['totalActiveDays'] == 187
+assert browsed == ['missing'], browsed
+print("   ✅ API failures are scraped with Selenium, API hits are not")
+
+print("\n" + "="*70)
+print("✅ TEST COMPLETE")
+print("="*70)
@@ -6,8 +6,9 @@ import os
 from pymongo import MongoClient
 from dotenv import load_dotenv
 from platform_scrapers import PlatformScraper
+from bulk_writer import BulkWriter
+from roster import iter_roster
 from datetime import datetime
-import time
 
 load_dotenv()
 
@@ -30,11 +31,14 @@ def update_codechef_contests():
         print("✅ Connected to MongoDB")
         
         # Get all active students with CodeChef usernames
-        students = list(students_collection.find({'isActive': True}))
-        print(f"📊 Found {len(students)} active students")
+        # Read the (projected) roster up front - scraping is slow enough for an open cursor to time out
+        students = list(iter_roster(students_collection))
+        total_students = len(students)
+        print(f"📊 Found {total_students} active students")
         
         # Initialize scraper
         scraper = PlatformScraper(delay=3)
+        writer = BulkWriter(students_collection)
         
         updated_count = 0
         failed_count = 0
@@ -46,10 +50,10 @@ def update_codechef_contests():
             codechef_username = student.get('platformUsernames', {}).get('codechef', '')
             
             if not codechef_username:
-                print(f"[{index}/{len(students)}] {student['name']}: ⚠️ No CodeChef username")
+                print(f"[{index}/{total_students}] {student['name']}: ⚠️ No CodeChef username")
                 continue
             
-            print(f"[{index}/{len(students)}] {student['name']}")
+            print(f"[{index}/{total_students}] {student['name']}")
             print(f"  🔍 CodeChef: {codechef_username}")
             
             try:
@@ -58,7 +62,7 @@ def update_codechef_contests():
                 
                 if data and data.get('contests', 0) > 0:
                     # Update MongoDB
-                    students_collection.update_one(
+                    writer.update_one(
                         {'_id': student['_id']},
                         {'$set': {
                             'platforms.codechef.contests': data['contests'],
@@ -76,16 +80,15 @@ def update_codechef_contests():
             except Exception as e:
                 print(f"    ❌ Error: {str(e)[:50]}")
                 failed_count += 1
-            
-            # Delay between requests
-            time.sleep(3)
+        
+        writer.close()
         
         # Final statistics
         print(f"\n{'='*70}")
         print("📊 UPDATE COMPLETE!")
         print(f"{'='*70}")
-        print(f"✅ Successfully updated: {updated_count}/{len(students)}")
-        print(f"❌ Failed: {failed_count}/{len(students)}")
+        print(f"✅ Successfully updated: {updated_count}/{total_students}")
+        print(f"❌ Failed: {failed_count}/{total_students}")
         print(f"{'='*70}\n")
         
         client.close()
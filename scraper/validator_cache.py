@@ -0,0 +1,105 @@
+"""
+Validator Cache - Conditional GETs with ETag / Last-Modified
+Stores the validators and body of each cacheable response and sends them
+back as If-None-Match / If-Modified-Since next time. A 304 is answered
+from the stored body; GitHub does not count 304s against the REST limit.
+"""
+import atexit
+import json
+import os
+import threading
+from datetime import datetime
+from urllib.parse import urlparse
+
+# Where validators and bodies are kept between runs
+HTTP_CACHE_PATH = os.getenv('HTTP_CACHE_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'http_cache.json'))
+
+# Hosts whose GET responses are revalidated (comma-separated in HTTP_CACHE_HOSTS)
+CACHEABLE_HOSTS = {
+    host.strip() for host in os.getenv('HTTP_CACHE_HOSTS', 'api.github.com').split(',') if host.strip()
+}
+
+class ValidatorCache:
+    """Per-URL ETag / Last-Modified and body, persisted to a JSON file"""
+    
+    def __init__(self, path=HTTP_CACHE_PATH, hosts=None):
+        self.path = path
+        self.hosts = CACHEABLE_HOSTS if hosts is None else set(hosts)
+        self.entries = None
+        self.dirty = False
+        self.hits = 0
+        self.lock = threading.Lock()
+        atexit.register(self.save)
+    
+    def _load(self):
+        if self.entries is None:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError):
+                self.entries = {}
+        return self.entries
+    
+    def cacheable(self, method, url):
+        """True for GETs to hosts this cache covers"""
+        return method.upper() == 'GET' and urlparse(url).hostname in self.hosts
+    
+    def conditional_headers(self, url):
+        """If-None-Match / If-Modified-Since for a URL seen before (empty dict otherwise)"""
+        with self.lock:
+            entry = self._load().get(url)
+        if not entry:
+            return {}
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('lastModified'):
+            headers['If-Modified-Since'] = entry['lastModified']
+        return headers
+    
+    def revalidate(self, url, status_code, headers, text):
+        """
+        Record a response to a conditional GET.
+        Returns the cached entry if the response was a 304 we can answer,
+        otherwise stores a fresh 200 and returns None.
+        """
+        with self.lock:
+            entries = self._load()
+            if status_code == 304:
+                entry = entries.get(url)
+                if entry:
+                    self.hits += 1
+                return entry
+            if status_code != 200:
+                return None
+            etag = headers.get('ETag')
+            last_modified = headers.get('Last-Modified')
+            if etag or last_modified:
+                entries[url] = {
+                    'etag': etag,
+                    'lastModified': last_modified,
+                    'contentType': headers.get('Content-Type', 'application/json'),
+                    'body': text,
+                    'storedAt': datetime.now().isoformat()
+                }
+                self.dirty = True
+            elif entries.pop(url, None):
+                self.dirty = True
+        return None
+    
+    def save(self):
+        """Write the cache to disk if anything changed"""
+        with self.lock:
+            if not self.dirty:
+                return
+            tmp_path = f"{self.path}.tmp"
+            try:
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(self.entries, f)
+                os.replace(tmp_path, self.path)
+                self.dirty = False
+            except OSError as e:
+                print(f"⚠️ Could not save HTTP cache: {e}")
+
+# Shared by every scraper in this process
+default_cache = ValidatorCache()
@@ -0,0 +1,190 @@
+"""
+Weekly Rollup - Keep weeklyProgress and last-week stats current from snapshots
+Reads only the snapshots newer than the last watermark, and for each
+student they touch recomputes the current and previous week buckets
+(problems solved / contributions gained that week) plus lastWeekRating
+and lastWeekContributions. A few index seeks per affected student, so the
+cost follows new data, not history - cheap enough to run after every scrape.
+"""
+import os
+from datetime import datetime, timedelta
+from pymongo import MongoClient
+from dotenv import load_dotenv
+from bulk_writer import BulkWriter
+from snapshot_store import SnapshotStore
+
+load_dotenv()
+
+MONGO_URI = os.getenv('MONGO_URI', 'mongodb://localhost:27017/go-tracker')
+
+ROLLUP_STATE_COLLECTION = 'rollupState'
+WATERMARK_ID = 'weeklyProgress'
+
+# The number a weekly bucket counts the growth of, per platform
+WEEKLY_FIELDS = {
+    'leetcode': 'problemsSolved',
+    'codechef': 'problemsSolved',
+    'codeforces': 'problemsSolved',
+    'github': 'contributions'
+}
+
+# Rating platforms whose lastWeekRating is filled
+RATING_PLATFORMS = ('leetcode', 'codechef', 'codeforces')
+
+# Platform fields this job owns - scrapes report them as 0 and must not overwrite them
+ROLLUP_FIELDS = ('lastWeekRating', 'lastWeekContributions')
+
+# Buckets kept on each student (override with WEEKLY_PROGRESS_WEEKS)
+WEEKS_KEPT = int(os.getenv('WEEKLY_PROGRESS_WEEKS', 12))
+
+def week_start(when):
+    """Monday 00:00 of the week containing `when`"""
+    day = when.replace(hour=0, minute=0, second=0, microsecond=0)
+    return day - timedelta(days=day.weekday())
+
+def week_label(start):
+    """Label in the dashboard's "Week N" format (N = ISO week number)"""
+    return f'Week {start.isocalendar()[1]}'
+
+def growth(later, earlier, field):
+    """Increase of `field` between two snapshots (0 without both, never negative)"""
+    if not later or not earlier or field not in later or field not in earlier:
+        return 0
+    return max(0, later[field] - earlier[field])
+
+def merge_buckets(progress, buckets, now, weeks_kept=WEEKS_KEPT):
+    """
+    Update (or insert) the given week buckets in a weeklyProgress list.
+    `buckets` is [(week start, {platform: value})] oldest first; other weeks
+    (including seeded ones without a weekStart) are kept as they are.
+    Buckets are matched on weekStart, since "Week N" labels repeat.
+    """
+    progress = [dict(entry) for entry in (progress or [])]
+    insert_at = None
+    for start, values in reversed(buckets):
+        existing = next((entry for entry in progress if entry.get('weekStart') == start), None)
+        if existing is None:
+            existing = {'week': week_label(start), 'weekStart': start, 'createdAt': now}
+            # Older buckets go right before the newer ones just placed
+            progress.insert(len(progress) if insert_at is None else insert_at, existing)
+        existing.update(values)
+        existing['updatedAt'] = now
+        insert_at = progress.index(existing)
+    return progress[-weeks_kept:]
+
+class WeeklyRollup:
+    """Incremental rollup of platformSnapshots into students' weekly progress"""
+    
+    def __init__(self, db, snapshots=None, verbose=True):
+        self.db = db
+        self.students = db.students
+        self.state = db[ROLLUP_STATE_COLLECTION]
+        self.snapshots = snapshots or SnapshotStore(db)
+        self.verbose = verbose
+    
+    def watermark(self):
+        """Timestamp of the newest snapshot already rolled up (None on the first run)"""
+        state = self.state.find_one({'_id': WATERMARK_ID})
+        return state.get('watermark') if state else None
+    
+    def new_activity(self, since, until):
+        """({student id: {platforms}}, newest ts) for snapshots in (since, until]"""
+        affected = {}
+        newest = None
+        cursor = self.snapshots.collection.find(
+            {'ts': {'$gt': since, '$lte': until}},
+            {'meta': 1, 'ts': 1, '_id': 0}
+        )
+        try:
+            for point in cursor:
+                meta = point.get('meta') or {}
+                affected.setdefault(meta.get('studentId'), set()).add(meta.get('platform'))
+                if newest is None or point['ts'] > newest:
+                    newest = point['ts']
+        finally:
+            cursor.close()
+        return affected, newest
+    
+    def student_update(self, student, platforms, now):
+        """$set for one student's current/previous week buckets and last-week stats"""
+        this_week = week_start(now)
+        last_week = this_week - timedelta(days=7)
+        week_ago = now - timedelta(days=7)
+        
+        current_values, previous_values, fields = {}, {}, {}
+        for platform in platforms:
+            latest, start_this, start_last, then = (
+                self.snapshots.value_at(student['_id'], platform, when)
+                for when in (now, this_week, last_week, week_ago)
+            )
+            if latest is None:
+                continue
+            
+            field = WEEKLY_FIELDS.get(platform)
+            if field:
+                current_values[platform] = growth(latest, start_this, field)
+                previous_values[platform] = growth(start_this, start_last, field)
+            if platform in RATING_PLATFORMS and then and 'rating' in then:
+                fields[f'platforms.{platform}.lastWeekRating'] = then['rating']
+            if platform == 'github':
+                fields['platforms.github.lastWeekContributions'] = growth(latest, then, 'contributions')
+        
+        if current_values:
+            fields['weeklyProgress'] = merge_buckets(
+                student.get('weeklyProgress'),
+                [(last_week, previous_values), (this_week, current_values)],
+                now
+            )
+        return {'$set': fields} if fields else None
+    
+    def run(self, now=None):
+        """Roll up snapshots since the watermark; returns the number of students updated"""
+        now = now or datetime.now()
+        since = self.watermark()
+        if since is None:
+            # First run: only the two weeks the buckets cover
+            since = week_start(now) - timedelta(days=7)
+        
+        affected, newest = self.new_activity(since, now)
+        if not affected:
+            if self.verbose:
+                print("📅 Weekly rollup: no new snapshots")
+            return 0
+        
+        writer = BulkWriter(self.students, verbose=False)
+        updated = 0
+        cursor = self.students.find(
+            {'_id': {'$in': list(affected)}},
+            {'weeklyProgress': 1}
+        )
+        try:
+            for student in cursor:
+                update = self.student_update(student, affected[student['_id']], now)
+                if update:
+                    writer.update_one({'_id': student['_id']}, update)
+                    updated += 1
+        finally:
+            cursor.close()
+        totals = writer.close()
+        
+        # Move the watermark only once the buckets are written
+        if not totals['errors']:
+            self.state.update_one(
+                {'_id': WATERMARK_ID},
+                {'$set': {'watermark': newest, 'updatedAt': now}},
+                upsert=True
+            )
+        if self.verbose:
+            print(f"📅 Weekly rollup: {updated} students from {len(affected)} with new snapshots ({totals['errors']} errors)")
+        return updated
+
+def main():
+    """Run the rollup once"""
+    client = MongoClient(MONGO_URI)
+    try:
+        WeeklyRollup(client['go-tracker']).run()
+    finally:
+        client.close()
+
+if __name__ == '__main__':
+    main()